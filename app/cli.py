@@ -0,0 +1,213 @@
+# app/cli.py
+#
+# 운영용 명령어 모음
+#   python -m app.cli backfill-daily-activity [--user-id 1]
+#   python -m app.cli rebuild-quest-tags [--user-id 1]
+#   python -m app.cli repair-hero-stats [--user-id 1]
+#   python -m app.cli add-columns
+#   python -m app.cli dedupe-receipts
+#   python -m app.cli create-indexes
+#   python -m app.cli import-users accounts.csv
+
+import argparse
+import asyncio
+import csv
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from app import models  # noqa: F401  (메타데이터에 모델 등록)
+from app.database import AsyncSessionLocal, Base, engine
+from app.core import daily_activity, hero_stats, inventory, quest_tags, user_import
+
+
+async def backfill_daily_activity(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        written = await daily_activity.rebuild_daily_activity(db, args.user_id)
+    print(f"user_daily_activity rebuilt: {written} rows")
+
+
+async def rebuild_quest_tags(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        written = await quest_tags.rebuild_quest_tags(db, args.user_id)
+    print(f"quest_tags rebuilt: {written} rows")
+
+
+async def repair_hero_stats(args: argparse.Namespace) -> None:
+    hero_stats.load_tag_stat_deltas()
+    async with AsyncSessionLocal() as db:
+        updated = await hero_stats.repair_hero_stats(db, args.user_id)
+    print(f"hero stats repaired: {updated} heroes")
+
+
+def _add_missing_columns(connection) -> list:
+    """이미 있는 테이블에 모델에 선언된 컬럼 중 없는 것을 ALTER TABLE ... ADD COLUMN 으로 추가합니다.
+
+    create_all 은 기존 테이블을 바꾸지 않고 init.sql 은 새 볼륨에서만 실행되므로,
+    컬럼이 추가된 버전을 기존 DB에 배포할 때 서버를 띄우기 전에 실행합니다.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+async def add_columns(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        added = await conn.run_sync(_add_missing_columns)
+    print(f"columns added: {', '.join(added) if added else 'none'}")
+    # 능력치 컬럼을 처음 추가한 DB는 기존 완료 이력으로 능력치를 채워야
+    # 이후 퀘스트 삭제 시 차감이 맞음
+    if "heroes.endurance" in added:
+        await repair_hero_stats(argparse.Namespace(user_id=None))
+
+
+def _is_covered(columns: list, unique: bool, existing: list) -> bool:
+    """같은 컬럼 목록(순서 포함)의 인덱스가 이미 있으면 True (유니크 인덱스는 유니크끼리만 인정)
+
+    앞부분만 같은 인덱스는 인정하지 않아, 어떤 순서로 검사해도 결과가 models.py 의 선언과 같아집니다.
+    """
+    return any(
+        other_columns == columns and (other_unique or not unique)
+        for other_columns, other_unique in existing
+    )
+
+
+def _create_missing_indexes(connection) -> list:
+    """이미 있는 테이블에 모델에 선언된 인덱스 중 없는 것을 만듭니다. (create_all 은 기존 테이블을 건드리지 않음)
+
+    init.sql 의 인덱스는 모델과 이름이 다를 수 있으므로 이름이 아니라 컬럼 목록과 유니크 여부로 비교해,
+    기본 키나 기존 인덱스가 정확히 같은 컬럼이면 만들지 않습니다.
+    """
+    inspector = inspect(connection)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = [
+            (index["column_names"], bool(index.get("unique")))
+            for index in inspector.get_indexes(table.name)
+        ]
+        primary_key = inspector.get_pk_constraint(table.name).get("constrained_columns") or []
+        if primary_key:
+            existing.append((primary_key, True))
+        for index in table.indexes:
+            columns = [column.name for column in index.columns]
+            if _is_covered(columns, bool(index.unique), existing):
+                continue
+            index.create(connection)
+            existing.append((columns, bool(index.unique)))
+            created.append(f"{table.name}.{index.name}")
+    return created
+
+
+async def dedupe_receipts(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        removed = await inventory.dedupe_receipts(db)
+    print(f"duplicate receipts removed: {removed}")
+
+
+async def create_indexes(args: argparse.Namespace) -> None:
+    # uq_receipts_user_item 은 중복 구매 행이 있으면 만들 수 없으므로 먼저 정리
+    await dedupe_receipts(args)
+    async with engine.begin() as conn:
+        created = await conn.run_sync(_create_missing_indexes)
+    print(f"indexes created: {', '.join(created) if created else 'none'}")
+
+
+async def import_users(args: argparse.Namespace) -> None:
+    # CSV 헤더: email,password,name[,phone_number]
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        accounts = [
+            {
+                "email": row["email"],
+                "password": row["password"],
+                "name": row["name"],
+                "phone_number": row.get("phone_number") or None,
+            }
+            for row in csv.DictReader(f)
+        ]
+    async with AsyncSessionLocal() as db:
+        result = await user_import.import_users(db, accounts)
+    print(f"users imported: {result['created']} created, {len(result['skipped'])} skipped")
+    for item in result["skipped"]:
+        print(f"  skipped {item['email']} ({item['reason']})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill-daily-activity",
+        help="quests 테이블로부터 user_daily_activity 를 다시 만듭니다."
+    )
+    backfill.add_argument("--user-id", type=int, default=None)
+    backfill.set_defaults(handler=backfill_daily_activity)
+
+    tags = commands.add_parser(
+        "rebuild-quest-tags",
+        help="quests.tag 로부터 quest_tags 인덱스를 다시 만듭니다."
+    )
+    tags.add_argument("--user-id", type=int, default=None)
+    tags.set_defaults(handler=rebuild_quest_tags)
+
+    stats = commands.add_parser(
+        "repair-hero-stats",
+        help="완료 퀘스트 이력으로부터 영웅 능력치를 다시 계산합니다. (quest_tags 필요)"
+    )
+    stats.add_argument("--user-id", type=int, default=None)
+    stats.set_defaults(handler=repair_hero_stats)
+
+    columns = commands.add_parser(
+        "add-columns",
+        help="기존 테이블에 모델에 선언된 컬럼 중 없는 것을 추가합니다. (능력치 컬럼을 추가하면 능력치도 다시 계산)"
+    )
+    columns.set_defaults(handler=add_columns)
+
+    receipts = commands.add_parser(
+        "dedupe-receipts",
+        help="같은 (user_id, item_id) 영수증 중 가장 먼저 생긴 것만 남깁니다. (유니크 인덱스 생성 전 실행)"
+    )
+    receipts.set_defaults(handler=dedupe_receipts)
+
+    indexes = commands.add_parser(
+        "create-indexes",
+        help="기존 테이블에 모델에 선언된 인덱스 중 없는 것을 만듭니다. (중복 영수증을 먼저 정리)"
+    )
+    indexes.set_defaults(handler=create_indexes)
+
+    imports = commands.add_parser(
+        "import-users",
+        help="CSV(email,password,name[,phone_number])의 계정을 사용자·영웅으로 일괄 등록합니다."
+    )
+    imports.add_argument("path")
+    imports.set_defaults(handler=import_users)
+
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pydantic import BaseSettings
 from functools import lru_cache
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
 
@@ -10,6 +11,63 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DATABASE_URL: str
+    # 태그별 능력치 증가량 JSON 파일 경로 (없으면 기본 테이블 사용)
+    TAG_STAT_DELTAS_PATH: Optional[str] = None
+    # 통계 응답 캐시
+    STATS_CACHE_TTL_SECONDS: int = 60
+    STATS_CACHE_MAX_ENTRIES: int = 10000
+    STATS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    STATS_CACHE_BACKEND: Optional[str] = None  # None(프로세스 내) 또는 "local"(공유 백엔드 대체 구현)
+    # 대시보드 섹션 동시 실행 (섹션마다 별도 세션, 요청당 최대 동시 세션 수 제한)
+    STATS_CONCURRENT_SECTIONS: bool = True
+    STATS_MAX_CONCURRENT_SECTIONS: int = 3
+    # 랭킹 상위 구간 메모리 캐시
+    LEADERBOARD_CACHE_SIZE: int = 1000
+    LEADERBOARD_REFRESH_SECONDS: int = 60
+    # 내 순위 조회용 전체 순위 구조 재구축 주기
+    RANK_INDEX_REFRESH_SECONDS: int = 600
+    # 비밀번호 해싱 (bcrypt 비용, 전용 스레드 풀 크기, 실행+대기 작업 상한 — 넘으면 503)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # 계정 일괄 등록용 해싱 스레드 수 (로그인용 풀과 별도, 비우면 CPU 코어 수 — 1 로 두면 순차 해싱)
+    PASSWORD_HASH_BULK_WORKERS: Optional[int] = None
+    # 인증된 사용자 캐시 (토큰 sub·exp 별, 토큰 만료 전까지만 보관)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # 계정 일괄 등록 요청당 최대 계정 수, 결과를 보관하는 최근 작업 수
+    USER_IMPORT_MAX_ACCOUNTS: int = 5000
+    USER_IMPORT_KEEP_JOBS: int = 100
+    # 아이템 카탈로그 메모리 캐시 재확인 주기 (다른 워커에서 갱신된 아이템 반영)
+    ITEM_CATALOG_REFRESH_SECONDS: int = 300
+    # 사용자별 보유 아이템 비트셋 캐시
+    INVENTORY_CACHE_TTL_SECONDS: int = 300
+    INVENTORY_CACHE_MAX_ENTRIES: int = 50000
+    # 퀘스트 일괄 생성·클리어·삭제 요청당 최대 작업 수
+    QUEST_BATCH_MAX_OPERATIONS: int = 100
+    # 영웅 보상 일괄 지급 요청당 최대 지급 건수
+    HERO_REWARD_BATCH_MAX: int = 1000
+    # 커밋 이후 이벤트 처리 (아웃박스 워커 수, 묶음 크기, 재시도)
+    EVENT_WORKERS: int = 2
+    EVENT_BATCH_SIZE: int = 100
+    EVENT_MAX_ATTEMPTS: int = 5
+    EVENT_RETRY_BASE_SECONDS: float = 2.0
+    EVENT_POLL_SECONDS: float = 1.0
+    # 퀘스트 완료 시 서버에서 코인·레벨을 지급할지 (기존 클라이언트는 클리어 후 /hero/reward·/hero/level-up 을
+    # 직접 호출하므로, 클라이언트가 그 호출을 뺀 뒤에 켬 — 켜면 두 엔드포인트는 410 으로 응답)
+    QUEST_SERVER_REWARDS: bool = False
+    # 퀘스트 완료 보상 코인 (QUEST_SERVER_REWARDS 가 켜져 있을 때)
+    QUEST_COMPLETION_COIN: int = 10
+    # 마감 지난 미완료 퀘스트 스위퍼 (실행 주기, 한 트랜잭션에서 처리하는 퀘스트 수, 묶음 사이 휴식)
+    DEADLINE_SWEEP_INTERVAL_SECONDS: float = 60.0
+    DEADLINE_SWEEP_CHUNK_SIZE: int = 500
+    DEADLINE_SWEEP_PAUSE_SECONDS: float = 0.05
+    # AI 퀘스트 생성기와 태그별 사전 생성 풀 (풀 크기, 동시 생성 수, 폐기 기준 시간)
+    AI_QUEST_GENERATOR: str = "local"
+    AI_QUEST_TAGS: List[str] = ["운동 및 스포츠", "공부", "자기개발", "취미", "명상 및 스트레칭"]
+    AI_QUEST_POOL_SIZE: int = 20
+    AI_QUEST_POOL_REFILL_CONCURRENCY: int = 2
+    AI_QUEST_POOL_STALE_SECONDS: float = 6 * 3600
 
     class Config:
         env_file = ".env"
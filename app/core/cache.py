@@ -0,0 +1,163 @@
+# app/core/cache.py
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """값의 대략적인 메모리 사용량(JSON 직렬화 길이)을 바이트 단위로 추정합니다."""
+    try:
+        return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class LRUCache:
+    """TTL 과 메모리 예산이 있는 프로세스 내 LRU 캐시
+
+    항목 수(max_entries) 또는 추정 크기 합(max_bytes)을 넘으면 가장 오래 쓰지 않은 항목부터 내보냅니다.
+    on_remove 를 주면 항목이 빠질 때마다(퇴출·만료·삭제) 키를 넘겨 호출합니다. (키별 부가 정보 정리용)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        size_of: Callable[[Any], int] = estimate_size,
+        on_remove: Optional[Callable[[Hashable], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.on_remove = on_remove
+        self._size_of = size_of if max_bytes else (lambda value: 0)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, _, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._size_of(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # 예산보다 큰 값은 캐시하지 않음
+            self.delete(key)
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (expires_at, size, value)
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self) -> None:
+        keys = list(self._data)
+        self._data.clear()
+        self._bytes = 0
+        if self.on_remove is not None:
+            for key in keys:
+                self.on_remove(key)
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+        if self.on_remove is not None:
+            self.on_remove(key)
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+
+class CacheBackend(ABC):
+    """여러 워커가 공유하는 캐시 백엔드 인터페이스 (예: Redis)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+
+class LocalCacheBackend(CacheBackend):
+    """공유 백엔드 대신 쓰는 프로세스 내 구현 (테스트·로컬 개발용)"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+
+    async def incr(self, key: str) -> int:
+        current = await self.get(key)
+        value = int(current or 0) + 1
+        self._data[key] = (None, str(value))
+        return value
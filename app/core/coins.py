@@ -0,0 +1,65 @@
+# app/core/coins.py
+
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+
+# 일괄 지급 시 한 UPDATE 문에 넣는 영웅 수
+BATCH_SIZE = 1000
+
+
+async def spend(db: AsyncSession, user_id: int, amount: int) -> bool:
+    """코인이 충분할 때만 원자적으로 차감합니다. 차감했으면 True.
+
+    UPDATE heroes SET coin = coin - :amount WHERE user_id = :u AND coin >= :amount
+    조건과 차감이 한 문장이라 동시 구매에도 잔액이 음수가 되지 않습니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다.
+    """
+    hero = models.Hero
+    result = await db.execute(
+        update(hero)
+        .filter(hero.user_id == user_id, hero.coin >= amount)
+        .values(coin=hero.coin - amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def add(db: AsyncSession, user_id: int, amount: int) -> bool:
+    """코인을 원자적으로 더합니다. 영웅이 없으면 False."""
+    hero = models.Hero
+    result = await db.execute(
+        update(hero)
+        .filter(hero.user_id == user_id)
+        .values(coin=hero.coin + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def add_many(db: AsyncSession, amounts: Iterable[Tuple[int, int]]) -> List[int]:
+    """여러 사용자에게 코인을 더합니다. 영웅을 찾은 user_id 목록을 반환합니다.
+
+    같은 사용자가 여러 번 나오면 합산하고, BATCH_SIZE 명마다
+    UPDATE heroes SET coin = coin + CASE user_id WHEN .. THEN .. END WHERE user_id IN (..) 한 문장으로 처리합니다.
+    """
+    totals: Dict[int, int] = {}
+    for user_id, amount in amounts:
+        totals[user_id] = totals.get(user_id, 0) + amount
+
+    hero = models.Hero
+    user_ids = sorted(totals)  # 잠금 순서를 고정해 동시 지급 간 교착을 피함
+    credited: List[int] = []
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        chunk = user_ids[start:start + BATCH_SIZE]
+        await db.execute(
+            update(hero)
+            .filter(hero.user_id.in_(chunk))
+            .values(coin=hero.coin + case({user_id: totals[user_id] for user_id in chunk}, value=hero.user_id))
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(select(hero.user_id).filter(hero.user_id.in_(chunk)))
+        credited.extend(result.scalars().all())
+    return credited
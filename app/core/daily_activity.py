@@ -0,0 +1,147 @@
+# app/core/daily_activity.py
+
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..database import AsyncSessionLocal
+from .quest_tags import normalize_tags
+from .statistics_engine import XP_PER_QUEST
+from .utils import parse_tags
+
+# 백필 시 한 번에 INSERT 하는 행 수
+BACKFILL_BATCH_SIZE = 1000
+
+
+class _DailyDelta:
+    """하루치 집계에 더하거나 뺄 변화량"""
+
+    def __init__(self):
+        self.completed_count = 0
+        self.progress_seconds = 0
+        self.earned_xp = 0
+        self.tag_counts: Dict[str, int] = {}
+
+    def add(self, quest) -> None:
+        self.completed_count += 1
+        self.progress_seconds += quest.progress_time or 0
+        self.earned_xp += XP_PER_QUEST
+        for tag in normalize_tags(parse_tags(quest.tag)):
+            self.tag_counts[tag] = self.tag_counts.get(tag, 0) + 1
+
+
+def _group_by_day(quests: Iterable) -> Dict[Tuple[int, date], _DailyDelta]:
+    deltas: Dict[Tuple[int, date], _DailyDelta] = {}
+    for quest in quests:
+        if not quest.finish_time:
+            continue
+        key = (quest.user_id, quest.finish_time.date())
+        deltas.setdefault(key, _DailyDelta()).add(quest)
+    return deltas
+
+
+async def record_completions(db: AsyncSession, quests: Iterable) -> None:
+    """완료된 퀘스트들을 일별 집계에 더합니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다."""
+    await _apply(db, _group_by_day(quests), 1)
+
+
+async def revert_completions(db: AsyncSession, quests: Iterable) -> None:
+    """삭제되는 완료 퀘스트들을 일별 집계에서 뺍니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다."""
+    await _apply(db, _group_by_day(quests), -1)
+
+
+async def _apply(db: AsyncSession, deltas: Dict[Tuple[int, date], _DailyDelta], sign: int) -> None:
+    activity = models.UserDailyActivity
+    for (user_id, day), delta in sorted(deltas.items()):
+        # 행이 없으면 만들어 두고, 행 잠금을 잡은 뒤 갱신 (동시 완료 시 갱신 유실 방지)
+        await db.execute(
+            insert(activity).prefix_with("IGNORE").values(
+                user_id=user_id,
+                activity_date=day,
+                completed_count=0,
+                progress_seconds=0,
+                earned_xp=0,
+                tag_counts={},
+            )
+        )
+        result = await db.execute(
+            select(activity)
+            .filter(activity.user_id == user_id, activity.activity_date == day)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        row = result.scalar_one()
+
+        row.completed_count = max((row.completed_count or 0) + sign * delta.completed_count, 0)
+        row.progress_seconds = max((row.progress_seconds or 0) + sign * delta.progress_seconds, 0)
+        row.earned_xp = max((row.earned_xp or 0) + sign * delta.earned_xp, 0)
+
+        tag_counts = dict(row.tag_counts or {})
+        for tag, count in delta.tag_counts.items():
+            value = tag_counts.get(tag, 0) + sign * count
+            if value > 0:
+                tag_counts[tag] = value
+            else:
+                tag_counts.pop(tag, None)
+        row.tag_counts = tag_counts
+
+
+async def rebuild_daily_activity(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """quests 테이블로부터 일별 집계를 다시 만듭니다. (user_id 가 없으면 전체) 생성한 행 수를 반환합니다."""
+    activity = models.UserDailyActivity
+    quest = models.Quest
+
+    cleanup = delete(activity)
+    query = (
+        select(quest.user_id, quest.finish_time, quest.progress_time, quest.tag)
+        .filter(quest.finish == True, quest.finish_time.isnot(None))
+        .order_by(quest.user_id)
+        .execution_options(yield_per=BACKFILL_BATCH_SIZE)
+    )
+    if user_id is not None:
+        cleanup = cleanup.filter(activity.user_id == user_id)
+        query = query.filter(quest.user_id == user_id)
+
+    await db.execute(cleanup)
+
+    written = 0
+    pending: Dict[Tuple[int, date], _DailyDelta] = {}
+    current_user_id = None
+
+    # 서버 사이드 커서로 사용자 순으로 훑으면서 사용자 경계마다 INSERT 해 메모리 사용량을 일정하게 유지
+    # (스트리밍 중인 연결에서는 다른 쿼리를 실행할 수 없으므로 읽기용 세션을 따로 사용)
+    async with AsyncSessionLocal() as reader:
+        stream = await reader.stream(query)
+        async for row in stream:
+            if row.user_id != current_user_id and len(pending) >= BACKFILL_BATCH_SIZE:
+                written += await _insert_rows(db, pending)
+                pending = {}
+            current_user_id = row.user_id
+            key = (row.user_id, row.finish_time.date())
+            pending.setdefault(key, _DailyDelta()).add(row)
+
+    if pending:
+        written += await _insert_rows(db, pending)
+    await db.commit()
+    return written
+
+
+async def _insert_rows(db: AsyncSession, rows: Dict[Tuple[int, date], _DailyDelta]) -> int:
+    await db.execute(
+        insert(models.UserDailyActivity),
+        [
+            {
+                "user_id": user_id,
+                "activity_date": day,
+                "completed_count": delta.completed_count,
+                "progress_seconds": delta.progress_seconds,
+                "earned_xp": delta.earned_xp,
+                "tag_counts": delta.tag_counts,
+            }
+            for (user_id, day), delta in rows.items()
+        ],
+    )
+    return len(rows)
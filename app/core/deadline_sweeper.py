@@ -0,0 +1,150 @@
+# app/core/deadline_sweeper.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, update
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from .stats_cache import stats_cache
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineSweeper:
+    """마감이 지난 미완료 퀘스트를 주기적으로 expired 로 표시하는 백그라운드 작업
+
+    (finish, expired, deadline) 인덱스로 대상을 마감 순으로 chunk_size 개씩 읽어, 한 묶음마다
+    짧은 트랜잭션(SELECT ... FOR UPDATE SKIP LOCKED → UPDATE ... WHERE id IN → COMMIT)으로 처리하므로
+    quests 에 긴 잠금을 잡지 않고, 여러 워커가 동시에 돌아도 같은 행을 두고 기다리지 않습니다.
+    """
+
+    def __init__(self, interval_seconds: float, chunk_size: int, pause_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.expired_total = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_expired = 0
+        self.last_run_chunks = 0
+        self.last_run_seconds = 0.0
+        self.max_chunk_seconds = 0.0
+        self.lag_seconds = 0.0  # 실행 시작 시점의 가장 오래 밀린 마감 경과 시간
+
+    async def sweep(self) -> int:
+        """밀린 퀘스트를 모두 처리할 때까지 묶음 단위로 expired 로 표시하고 처리한 수를 반환합니다."""
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        self.lag_seconds = await self._lag(now)
+
+        expired = 0
+        chunks = 0
+        while True:
+            chunk_started = time.perf_counter()
+            count = await self._sweep_chunk(now)
+            if not count:
+                break
+            expired += count
+            chunks += 1
+            self.max_chunk_seconds = max(self.max_chunk_seconds, time.perf_counter() - chunk_started)
+            if count < self.chunk_size:
+                break
+            # 묶음 사이에 다른 요청이 잠금을 얻을 틈을 줌
+            await asyncio.sleep(self.pause_seconds)
+
+        self.runs += 1
+        self.expired_total += expired
+        self.last_run_at = now
+        self.last_run_expired = expired
+        self.last_run_chunks = chunks
+        self.last_run_seconds = time.perf_counter() - started
+        return expired
+
+    async def _lag(self, now: datetime) -> float:
+        quest = models.Quest
+        async with AsyncSessionLocal() as db:
+            oldest = (await db.execute(
+                select(func.min(quest.deadline))
+                .filter(quest.finish == False, quest.expired == False, quest.deadline < now)
+            )).scalar()
+        return (now - oldest).total_seconds() if oldest else 0.0
+
+    async def _sweep_chunk(self, now: datetime) -> int:
+        quest = models.Quest
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(quest.id, quest.user_id)
+                .filter(quest.finish == False, quest.expired == False, quest.deadline < now)
+                .order_by(quest.deadline)
+                .limit(self.chunk_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+            if not rows:
+                await db.commit()
+                return 0
+            await db.execute(
+                update(quest)
+                .filter(quest.id.in_([row.id for row in rows]))
+                .values(expired=True)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        for user_id in {row.user_id for row in rows}:
+            await stats_cache.invalidate_user(user_id)
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("deadline sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def metrics(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "chunk_size": self.chunk_size,
+            "runs": self.runs,
+            "expired_total": self.expired_total,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_expired": self.last_run_expired,
+            "last_run_chunks": self.last_run_chunks,
+            "last_run_ms": round(self.last_run_seconds * 1000, 2),
+            "max_chunk_ms": round(self.max_chunk_seconds * 1000, 2),
+            "lag_seconds": round(self.lag_seconds, 1),
+        }
+
+
+def _create_deadline_sweeper() -> DeadlineSweeper:
+    settings = get_settings()
+    return DeadlineSweeper(
+        interval_seconds=settings.DEADLINE_SWEEP_INTERVAL_SECONDS,
+        chunk_size=settings.DEADLINE_SWEEP_CHUNK_SIZE,
+        pause_seconds=settings.DEADLINE_SWEEP_PAUSE_SECONDS,
+    )
+
+
+deadline_sweeper = _create_deadline_sweeper()
@@ -0,0 +1,214 @@
+# app/core/events.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 핸들러: 이벤트 처리 트랜잭션 안에서 payload 묶음을 처리하고,
+# 커밋 이후에 할 일(캐시 무효화·랭킹 반영 등)이 있으면 인자 없는 코루틴 함수를 반환
+AfterCommit = Callable[[], Awaitable[None]]
+Handler = Callable[[AsyncSession, List[dict]], Awaitable[Optional[AfterCommit]]]
+
+
+class EventBus:
+    """트랜잭셔널 아웃박스 기반 프로세스 내 이벤트 버스
+
+    publish 는 호출한 쪽의 트랜잭션 안에서 event_outbox 에 이벤트를 기록하므로, 변경이 커밋되면
+    이벤트도 함께 남고 재시작해도 유실되지 않습니다. 백그라운드 워커들은 SELECT ... FOR UPDATE SKIP LOCKED
+    로 미처리 이벤트를 묶음으로 가져가 유형별 핸들러에 넘기고, 성공한 이벤트는 같은 트랜잭션에서 지웁니다.
+    실패한 이벤트는 지수 백오프로 재시도하고, max_attempts 를 넘으면 dead 로 남깁니다.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        batch_size: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        poll_seconds: float,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_seconds = poll_seconds
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.published = 0
+        self.processed = 0
+        self.failed = 0
+        self.dead = 0
+        self.batches = 0
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    async def publish(self, db: AsyncSession, event_type: str, payloads: List[dict]) -> None:
+        """이벤트를 아웃박스에 기록합니다. 호출한 쪽의 트랜잭션이 커밋되면 워커를 깨웁니다."""
+        if not payloads:
+            return
+        now = datetime.utcnow()
+        await db.execute(
+            insert(models.OutboxEvent),
+            [{"event_type": event_type, "payload": payload, "available_at": now} for payload in payloads],
+        )
+        self.published += len(payloads)
+        event.listen(db.sync_session, "after_commit", self._on_commit, once=True)
+
+    def _on_commit(self, session) -> None:
+        self.notify()
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def metrics(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "published": self.published,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dead": self.dead,
+            "batches": self.batches,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event batch failed")
+                processed = 0
+            if processed:
+                continue
+            # 처리할 이벤트가 없으면 커밋 알림이나 폴링 주기까지 대기 (다른 워커가 쓴 이벤트도 주기적으로 확인)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def process_batch(self) -> int:
+        """미처리 이벤트를 한 묶음 처리하고 가져온 이벤트 수를 반환합니다."""
+        outbox = models.OutboxEvent
+        after_commit: List[AfterCommit] = []
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(outbox)
+                .filter(outbox.dead == False, outbox.available_at <= datetime.utcnow())
+                .order_by(outbox.available_at, outbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            # 세이브포인트 롤백 시 ORM 객체가 만료될 수 있으므로 필요한 값만 꺼내 둠
+            rows = [(row.id, row.event_type, row.payload, row.attempts or 0) for row in result.scalars().all()]
+            if not rows:
+                await db.commit()
+                return 0
+
+            by_type: Dict[str, List[tuple]] = {}
+            for row in rows:
+                by_type.setdefault(row[1], []).append(row)
+
+            done: List[int] = []
+            failed: Dict[int, Exception] = {}
+            for event_type, events in by_type.items():
+                handlers = self._handlers.get(event_type, [])
+                try:
+                    after_commit.extend(await self._handle(db, handlers, [row[2] for row in events]))
+                    done.extend(row[0] for row in events)
+                except Exception:
+                    # 묶음이 실패하면 이벤트 하나씩 다시 시도해 문제 있는 이벤트만 재시도로 보냄
+                    for event_id, _, payload, _ in events:
+                        try:
+                            after_commit.extend(await self._handle(db, handlers, [payload]))
+                            done.append(event_id)
+                        except Exception as exc:
+                            failed[event_id] = exc
+
+            if done:
+                await db.execute(
+                    delete(outbox).filter(outbox.id.in_(done)).execution_options(synchronize_session=False)
+                )
+            for event_id, event_type, _, attempts in rows:
+                if event_id in failed:
+                    await self._schedule_retry(db, event_id, event_type, attempts + 1, failed[event_id])
+            await db.commit()
+
+        self.batches += 1
+        self.processed += len(done)
+        self.failed += len(failed)
+        for callback in after_commit:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("event after-commit callback failed")
+        return len(rows)
+
+    async def _handle(
+        self, db: AsyncSession, handlers: List[Handler], payloads: List[dict]
+    ) -> List[AfterCommit]:
+        callbacks = []
+        # 세이브포인트: 실패한 핸들러의 변경만 되돌리고 트랜잭션은 유지
+        async with db.begin_nested():
+            for handler in handlers:
+                callback = await handler(db, payloads)
+                if callback is not None:
+                    callbacks.append(callback)
+        return callbacks
+
+    async def _schedule_retry(
+        self, db: AsyncSession, event_id: int, event_type: str, attempts: int, exc: Exception
+    ) -> None:
+        values = {"attempts": attempts, "last_error": f"{type(exc).__name__}: {exc}"[:255]}
+        if attempts >= self.max_attempts:
+            values["dead"] = True
+            self.dead += 1
+            logger.error("event %s (%s) moved to dead after %s attempts", event_id, event_type, attempts)
+        else:
+            delay = self.retry_base_seconds * 2 ** (attempts - 1)
+            values["available_at"] = datetime.utcnow() + timedelta(seconds=delay)
+        outbox = models.OutboxEvent
+        await db.execute(
+            update(outbox).filter(outbox.id == event_id).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _create_event_bus() -> EventBus:
+    settings = get_settings()
+    return EventBus(
+        workers=settings.EVENT_WORKERS,
+        batch_size=settings.EVENT_BATCH_SIZE,
+        max_attempts=settings.EVENT_MAX_ATTEMPTS,
+        retry_base_seconds=settings.EVENT_RETRY_BASE_SECONDS,
+        poll_seconds=settings.EVENT_POLL_SECONDS,
+    )
+
+
+event_bus = _create_event_bus()
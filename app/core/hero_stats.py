@@ -0,0 +1,159 @@
+# app/core/hero_stats.py
+
+import json
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from .quest_tags import normalize_tags
+from .utils import parse_tags
+
+# 응답의 스탯 이름 → heroes 컬럼
+STAT_COLUMNS = {
+    "strength": "strength",  # 힘
+    "intelligence": "intelligence",  # 지능
+    "vitality": "stamina",  # 체력
+    "dexterity": "skill",  # 손재주
+    "endurance": "endurance",  # 인내력
+}
+BASE_STAT = 10
+MAX_STAT = 100
+# 복구 작업 시 한 번에 UPDATE 하는 영웅 수
+REPAIR_BATCH_SIZE = 1000
+
+# 태그별 능력치 증가량 (정수 컬럼에 누적하므로 정수만 사용)
+DEFAULT_TAG_STAT_DELTAS = {
+    "운동 및 스포츠": {"strength": 2, "vitality": 2},
+    "공부": {"intelligence": 3},
+    "자기개발": {"intelligence": 2, "dexterity": 1},
+    "취미": {"dexterity": 3},
+    "명상 및 스트레칭": {"vitality": 1, "endurance": 2},
+}
+# 위 테이블에 없는 태그(기타)는 모든 스탯에 균등하게 추가
+DEFAULT_OTHER_TAG_DELTA = {stat: 1 for stat in STAT_COLUMNS}
+
+_tag_deltas: Dict[str, Dict[str, int]] = DEFAULT_TAG_STAT_DELTAS
+_other_delta: Dict[str, int] = DEFAULT_OTHER_TAG_DELTA
+
+
+def load_tag_stat_deltas(path: Optional[str] = None) -> None:
+    """태그별 능력치 증가량 테이블을 불러옵니다. 애플리케이션 시작 시 한 번 호출됩니다.
+
+    JSON 형식: {"tags": {"공부": {"intelligence": 3}}, "other": {"strength": 1, ...}}
+    """
+    global _tag_deltas, _other_delta
+
+    path = path or get_settings().TAG_STAT_DELTAS_PATH
+    if not path:
+        _tag_deltas, _other_delta = DEFAULT_TAG_STAT_DELTAS, DEFAULT_OTHER_TAG_DELTA
+        return
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    _tag_deltas = {
+        tag: _validate_delta(delta) for tag, delta in data.get("tags", {}).items()
+    }
+    _other_delta = _validate_delta(data.get("other", DEFAULT_OTHER_TAG_DELTA))
+
+
+def _validate_delta(delta: Dict[str, int]) -> Dict[str, int]:
+    unknown = set(delta) - set(STAT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown stats in tag delta table: {sorted(unknown)}")
+    return {stat: int(value) for stat, value in delta.items()}
+
+
+def tag_delta(tag: str) -> Dict[str, int]:
+    return _tag_deltas.get(tag, _other_delta)
+
+
+def _add_tag(totals: Dict[str, int], tag: str, times: int = 1) -> None:
+    for stat, value in tag_delta(tag).items():
+        column = STAT_COLUMNS[stat]
+        totals[column] = totals.get(column, 0) + value * times
+
+
+def compute_deltas(quests: Iterable) -> Dict[int, Dict[str, int]]:
+    """퀘스트 목록으로부터 사용자별 heroes 컬럼 증가량을 계산합니다."""
+    deltas: Dict[int, Dict[str, int]] = {}
+    for quest in quests:
+        totals = deltas.setdefault(quest.user_id, {})
+        for tag in normalize_tags(parse_tags(quest.tag)):
+            _add_tag(totals, tag)
+    return deltas
+
+
+def _apply_delta(column, delta: int):
+    if delta >= 0:
+        return column + delta
+    return func.greatest(column + delta, 0)
+
+
+async def record_completions(db: AsyncSession, quests: Iterable, sign: int = 1) -> None:
+    """완료된(sign=-1 이면 취소된) 퀘스트의 태그만큼 영웅 능력치를 원자적으로 갱신합니다.
+
+    UPDATE heroes SET strength = strength + :d ... 형태라 동시 완료에도 갱신이 유실되지 않습니다.
+    차감할 때는 0 아래로 내려가지 않게 합니다. (능력치 반영 이전에 완료된 퀘스트를 지우는 경우)
+    호출한 쪽의 트랜잭션 안에서 실행됩니다.
+    """
+    hero = models.Hero
+    for user_id, totals in sorted(compute_deltas(quests).items()):
+        values = {
+            column: _apply_delta(getattr(hero, column), sign * amount)
+            for column, amount in totals.items()
+            if amount
+        }
+        if values:
+            await db.execute(update(hero).filter(hero.user_id == user_id).values(**values))
+
+
+async def repair_hero_stats(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """완료 퀘스트 이력(quest_tags)으로부터 영웅 능력치를 다시 계산합니다. 갱신한 영웅 수를 반환합니다."""
+    query = (
+        select(models.QuestTag.user_id, models.QuestTag.tag, func.count().label("count"))
+        .join(models.Quest, models.Quest.id == models.QuestTag.quest_id)
+        .filter(models.Quest.finish == True)
+        .group_by(models.QuestTag.user_id, models.QuestTag.tag)
+    )
+    hero_query = select(models.Hero.user_id)
+    if user_id is not None:
+        query = query.filter(models.QuestTag.user_id == user_id)
+        hero_query = hero_query.filter(models.Hero.user_id == user_id)
+
+    totals_by_user: Dict[int, Dict[str, int]] = {}
+    for row in (await db.execute(query)).all():
+        _add_tag(totals_by_user.setdefault(row.user_id, {}), row.tag, int(row.count))
+
+    # 완료 이력이 없는 영웅도 0으로 맞추기 위해 대상 영웅 전체를 갱신
+    hero_ids = [row.user_id for row in (await db.execute(hero_query)).all()]
+    params = [
+        {
+            "target_user_id": hero_user_id,
+            **{
+                f"new_{column}": totals_by_user.get(hero_user_id, {}).get(column, 0)
+                for column in STAT_COLUMNS.values()
+            },
+        }
+        for hero_user_id in hero_ids
+    ]
+    heroes = models.Hero.__table__
+    statement = (
+        update(heroes)
+        .where(heroes.c.user_id == bindparam("target_user_id"))
+        .values({column: bindparam(f"new_{column}") for column in STAT_COLUMNS.values()})
+    )
+    for start in range(0, len(params), REPAIR_BATCH_SIZE):
+        await db.execute(statement, params[start:start + REPAIR_BATCH_SIZE])
+    await db.commit()
+    return len(params)
+
+
+def build_stats(hero) -> Dict[str, int]:
+    """영웅에 누적된 능력치로 응답용 스탯을 만듭니다. (기본값 10, 최대 100)"""
+    return {
+        stat: min(BASE_STAT + (getattr(hero, column, 0) or 0), MAX_STAT)
+        for stat, column in STAT_COLUMNS.items()
+    }
@@ -0,0 +1,106 @@
+# app/core/inventory.py
+
+from typing import List
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from .cache import MISSING, LRUCache
+
+
+async def dedupe_receipts(db: AsyncSession) -> int:
+    """같은 (user_id, item_id) 영수증이 여러 개면 가장 먼저 생긴 것(id 최소)만 남기고 지웁니다.
+
+    uq_receipts_user_item 유니크 인덱스가 생기기 전에는 중복 구매 행이 허용됐으므로,
+    기존 DB에 인덱스를 만들기 전에 실행해야 합니다. 지운 행 수를 반환합니다.
+    """
+    # MySQL 은 DELETE 대상 테이블을 서브쿼리에서 읽을 수 없으므로 다중 테이블 DELETE 로 처리
+    result = await db.execute(text(
+        "DELETE r FROM receipts r "
+        "JOIN receipts k ON k.user_id = r.user_id AND k.item_id = r.item_id AND k.id < r.id"
+    ))
+    await db.commit()
+    return result.rowcount
+
+
+def bits_to_ids(bits: int) -> List[int]:
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class Inventory:
+    """사용자별 보유 아이템 집합을 아이템 id 비트셋(int)으로 캐시합니다.
+
+    보유 여부는 (bits >> item_id) & 1 로 O(1)에 확인합니다. 캐시에 없으면 receipts 의
+    (user_id, item_id) 유니크 인덱스만 읽어 채웁니다. 다른 워커에서 산 아이템은 캐시에 아직 없을 수 있어,
+    미보유로 나온 경우에만 DB 로 한 번 더 확인합니다.
+    """
+
+    def __init__(self, local: LRUCache):
+        self.local = local
+        self.rechecks = 0
+
+    async def owned_bits(self, db: AsyncSession, user_id: int) -> int:
+        bits = self.local.get(user_id)
+        if bits is MISSING:
+            bits = await self._load(db, user_id)
+        return bits
+
+    async def owned_ids(self, db: AsyncSession, user_id: int) -> List[int]:
+        return bits_to_ids(await self.owned_bits(db, user_id))
+
+    async def owns(self, db: AsyncSession, user_id: int, item_id: int) -> bool:
+        if (await self.owned_bits(db, user_id) >> item_id) & 1:
+            return True
+        self.rechecks += 1
+        result = await db.execute(
+            select(models.Receipt.id).filter(
+                models.Receipt.user_id == user_id,
+                models.Receipt.item_id == item_id
+            )
+        )
+        if result.first() is None:
+            return False
+        self.add(user_id, item_id)
+        return True
+
+    def add(self, user_id: int, item_id: int) -> None:
+        """구매를 커밋한 뒤 호출합니다. 캐시에 있는 사용자만 비트를 켭니다."""
+        bits = self.local.get(user_id)
+        if bits is not MISSING:
+            self.local.set(user_id, bits | (1 << item_id))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.local.delete(user_id)
+
+    def metrics(self) -> dict:
+        return {**self.local.metrics(), "rechecks": self.rechecks}
+
+    async def _load(self, db: AsyncSession, user_id: int) -> int:
+        result = await db.execute(
+            select(models.Receipt.item_id).filter(models.Receipt.user_id == user_id)
+        )
+        bits = 0
+        for item_id in result.scalars().all():
+            bits |= 1 << item_id
+        self.local.set(user_id, bits)
+        return bits
+
+
+def _create_inventory() -> Inventory:
+    settings = get_settings()
+    return Inventory(
+        LRUCache(
+            max_entries=settings.INVENTORY_CACHE_MAX_ENTRIES,
+            ttl=settings.INVENTORY_CACHE_TTL_SECONDS,
+        )
+    )
+
+
+inventory = _create_inventory()
@@ -0,0 +1,97 @@
+# app/core/item_catalog.py
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+
+
+class ItemCatalog:
+    """items 테이블 전체를 메모리에 들고 id·item_type 으로 조회하는 카탈로그
+
+    아이템은 새 꾸미기 아이템을 배포할 때만 바뀌므로 시작 시 한 번 읽고, 이후에는
+    refresh_seconds 마다(또는 refresh 호출 시) 다시 읽어 내용이 달라졌을 때만 version 을 올립니다.
+    etag 는 내용의 해시라 워커가 달라도 같은 카탈로그면 같은 값입니다.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self.etag: Optional[str] = None
+        self._by_id: Dict[int, dict] = {}
+        self._by_type: Dict[str, List[dict]] = {}
+        self._items: List[dict] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+
+    async def load(self, db: AsyncSession) -> bool:
+        """items 를 다시 읽습니다. 내용이 바뀌었으면 version 을 올리고 True 를 반환합니다."""
+        result = await db.execute(
+            select(models.Item.id, models.Item.name, models.Item.price, models.Item.item_type)
+            .order_by(models.Item.id)
+        )
+        items = [dict(row._mapping) for row in result.all()]
+        digest = hashlib.sha1(
+            json.dumps(items, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+        etag = f'"{digest}"'
+        if etag == self.etag:
+            return False
+        by_type: Dict[str, List[dict]] = {}
+        for item in items:
+            by_type.setdefault(item["item_type"], []).append(item)
+        self._items = items
+        self._by_id = {item["id"]: item for item in items}
+        self._by_type = by_type
+        self.etag = etag
+        self.version += 1
+        return True
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if not self._is_fresh():
+                await self.load(db)
+
+    async def refresh(self, db: AsyncSession) -> bool:
+        """아이템 변경 후 즉시 다시 읽습니다."""
+        async with self._lock:
+            return await self.load(db)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_seconds
+        )
+
+    def get(self, item_id: int) -> Optional[dict]:
+        return self._by_id.get(item_id)
+
+    def items(self, item_type: Optional[str] = None) -> List[dict]:
+        if item_type is None:
+            return self._items
+        return self._by_type.get(item_type, [])
+
+    def metrics(self) -> dict:
+        return {
+            "items": len(self._items),
+            "types": len(self._by_type),
+            "version": self.version,
+            "etag": self.etag,
+            "reloads": self.reloads,
+        }
+
+
+item_catalog = ItemCatalog(refresh_seconds=get_settings().ITEM_CATALOG_REFRESH_SECONDS)
@@ -0,0 +1,574 @@
+# app/core/leaderboard.py
+
+import asyncio
+import logging
+import random
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 정렬 키: hero_level 내림차순, 이름 오름차순, id 오름차순
+RankKey = Tuple[int, str, int]
+
+# DB 정렬을 파이썬 비교와 맞춤: 레벨 NULL 은 0, 이름은 코드 포인트 순서(utf8mb4_0900_bin)로 비교
+# 테이블 기본 콜레이션(utf8mb4_0900_ai_ci)은 유니코드 정렬 알고리즘(UCA)의 대소문자·악센트 무시 비교라
+# 파이썬에서 똑같이 계산할 수 없고, 메모리 구조(bisect·스킵 리스트)와 DB keyset 페이지가 같은 순서를
+# 써야 순위가 어긋나거나 페이지가 겹치지 않으므로 양쪽 모두 계산 가능한 코드 포인트 순서를 씁니다.
+# 그 결과 레벨이 같은 사용자끼리는 대문자가 소문자보다, 악센트 없는 글자가 있는 글자보다 앞에 옵니다.
+_LEVEL = func.coalesce(models.Hero.hero_level, 0)
+_NAME = models.User.name.collate("utf8mb4_0900_bin")
+
+
+def rank_key(level: int, name: str, user_id: int) -> RankKey:
+    return (-(level or 0), name or "", user_id)
+
+
+def _ranking_query():
+    return (
+        select(models.User.id, models.User.name, models.User.profile_img, models.Hero.hero_level)
+        .join(models.Hero, models.User.id == models.Hero.user_id)
+        .order_by(_LEVEL.desc(), _NAME.asc(), models.User.id.asc())
+    )
+
+
+def _entry(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "profile_img": row.profile_img,
+        "hero_level": row.hero_level or 0,
+    }
+
+
+class Leaderboard:
+    """전체 랭킹의 상위 구간을 정렬된 리스트로 메모리에 들고 있는 리더보드
+
+    상위 size 명만 보관하며, 보관 중인 구간 안에서는 DB 와 같은 순서를 보장합니다.
+    레벨이 바뀐 사용자가 구간 안에 있으면 제자리에서 갱신하고, 구간 밖 사용자가 들어와야 하는데
+    이름을 모르면 다음 조회 때 구간을 다시 읽습니다. 구간을 벗어난 페이지는 DB keyset 쿼리로 응답합니다.
+    """
+
+    def __init__(self, size: int, refresh_seconds: int):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self._keys: List[RankKey] = []
+        self._entries: Dict[int, dict] = {}
+        self._complete = False  # 전체 사용자가 구간 안에 다 들어있는지
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    async def page(
+        self, db: AsyncSession, limit: int, after: Optional[RankKey] = None
+    ) -> List[dict]:
+        """after 다음 순위부터 limit 명을 반환합니다. (after 가 없으면 1위부터)"""
+        await self._ensure_fresh(db)
+
+        start = bisect_right(self._keys, after) if after else 0
+        end = start + limit
+        if self._complete or end <= len(self._keys):
+            self.hits += 1
+            return [self._entries[key[2]] for key in self._keys[start:end]]
+
+        self.misses += 1
+        return await self._page_from_db(db, limit, after)
+
+    def update_level(
+        self,
+        user_id: int,
+        level: int,
+        name: Optional[str] = None,
+        profile_img: Optional[str] = None,
+    ) -> None:
+        """사용자의 레벨 변경(또는 신규 영웅)을 반영합니다. 커밋 이후 호출합니다."""
+        if self._loaded_at is None:
+            return
+
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._remove_key(rank_key(entry["hero_level"], entry["name"], user_id))
+            entry = {**entry, "hero_level": level}
+        elif name is not None:
+            entry = {"id": user_id, "name": name, "profile_img": profile_img, "hero_level": level}
+
+        if entry is None:
+            # 이름을 모르는 사용자가 구간 안으로 들어올 수 있으면 다음 조회 때 다시 읽음
+            if self._complete or not self._keys or -level <= self._keys[-1][0]:
+                self._loaded_at = None
+            return
+
+        key = rank_key(level, entry["name"], user_id)
+        if self._complete or (self._keys and key <= self._keys[-1]):
+            insort(self._keys, key)
+            self._entries[user_id] = entry
+            if len(self._keys) > self.size:
+                dropped = self._keys.pop()
+                self._entries.pop(dropped[2], None)
+                self._complete = False
+        # 구간 밖으로 밀려난 사용자는 버림 (남은 구간은 여전히 정확한 상위 순위)
+        if not self._complete and len(self._keys) < self.size // 2:
+            self._loaded_at = None
+
+    def _remove_key(self, key: RankKey) -> None:
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            self._keys.pop(index)
+            return
+        # 정렬이 어긋난 경우: 해당 키만 지우고 다음 조회 때 구간을 다시 읽음
+        if key in self._keys:
+            self._keys.remove(key)
+        self._loaded_at = None
+
+    def update_profile(self, user_id: int, profile_img: Optional[str]) -> None:
+        """구간 안 사용자의 프로필 이미지를 바꿉니다. (정렬 키는 그대로)"""
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._entries[user_id] = {**entry, "profile_img": profile_img}
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._keys),
+            "size": self.size,
+            "complete": self._complete,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+    async def _ensure_fresh(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            result = await db.execute(_ranking_query().limit(self.size))
+            entries = [_entry(row) for row in result.all()]
+            self._entries = {entry["id"]: entry for entry in entries}
+            self._keys = [rank_key(e["hero_level"], e["name"], e["id"]) for e in entries]
+            self._complete = len(entries) < self.size
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+
+    def _is_fresh(self) -> bool:
+        # 다른 워커에서 바뀐 레벨도 반영되도록 주기적으로 다시 읽음
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_seconds
+        )
+
+    async def _page_from_db(
+        self, db: AsyncSession, limit: int, after: Optional[RankKey]
+    ) -> List[dict]:
+        query = _ranking_query()
+        if after:
+            neg_level, name, user_id = after
+            level = -neg_level
+            query = query.filter(
+                or_(
+                    _LEVEL < level,
+                    and_(
+                        _LEVEL == level,
+                        or_(
+                            _NAME > name,
+                            and_(_NAME == name, models.User.id > user_id),
+                        ),
+                    ),
+                )
+            )
+        result = await db.execute(query.limit(limit))
+        return [_entry(row) for row in result.all()]
+
+
+class FenwickTree:
+    """레벨별 사용자 수를 담는 펜윅 트리 (구간 합·k번째 검색 O(log n))"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, index: int, delta: int) -> None:
+        index += 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """0..index 구간의 합"""
+        index = min(index, self.size - 1) + 1
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def find_kth(self, k: int) -> int:
+        """prefix_sum(i) >= k 인 가장 작은 i"""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self._tree[nxt] < k:
+                position = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return position
+
+
+# 스킵 리스트 최대 높이 (2^32 명까지 기대 O(log n) 유지)
+MAX_SKIP_HEIGHT = 32
+
+
+class _SkipNode:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, height: int):
+        self.key = key
+        self.next: List[Optional["_SkipNode"]] = [None] * height
+        # width[i]: i 단계에서 다음 노드까지 건너뛰는 위치 수
+        self.width = [1] * height
+
+
+class OrderedKeys:
+    """정렬된 키 목록 (인덱스 가능한 스킵 리스트)
+
+    삽입·삭제·순위(index)·k번째 조회가 모두 기대 O(log n)입니다.
+    정렬된 리스트에 insort 하면 같은 레벨 인원이 많을 때 O(n) 이동이 생기므로 대신 사용합니다.
+    """
+
+    def __init__(self):
+        self._head = _SkipNode(None, MAX_SKIP_HEIGHT)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_sorted(cls, keys) -> "OrderedKeys":
+        """이미 정렬된 키들로 O(n)에 만듭니다. (재구축용)"""
+        ordered = cls()
+        tails = [ordered._head] * MAX_SKIP_HEIGHT
+        tail_positions = [0] * MAX_SKIP_HEIGHT
+        position = 0
+        for key in keys:
+            position += 1
+            node = _SkipNode(key, _random_height())
+            for level in range(len(node.next)):
+                tails[level].next[level] = node
+                tails[level].width[level] = position - tail_positions[level]
+                tails[level] = node
+                tail_positions[level] = position
+        for level in range(MAX_SKIP_HEIGHT):
+            tails[level].width[level] = position + 1 - tail_positions[level]
+        ordered._size = position
+        return ordered
+
+    def add(self, key) -> None:
+        path, positions = self._search(key)
+        position = positions[0] + 1
+        node = _SkipNode(key, _random_height())
+        for level in range(len(node.next)):
+            previous = path[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            node.width[level] = positions[level] + previous.width[level] + 1 - position
+            previous.width[level] = position - positions[level]
+        for level in range(len(node.next), MAX_SKIP_HEIGHT):
+            path[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key) -> None:
+        path, _ = self._search(key)
+        node = path[0].next[0]
+        if node is None or node.key != key:
+            raise ValueError(key)
+        for level in range(len(node.next)):
+            previous = path[level]
+            previous.next[level] = node.next[level]
+            previous.width[level] += node.width[level] - 1
+        for level in range(len(node.next), MAX_SKIP_HEIGHT):
+            path[level].width[level] -= 1
+        self._size -= 1
+
+    def index(self, key) -> int:
+        """key 보다 작은 키의 수"""
+        node = self._head
+        position = 0
+        for level in range(MAX_SKIP_HEIGHT - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        target = index + 1
+        node = self._head
+        position = 0
+        for level in range(MAX_SKIP_HEIGHT - 1, -1, -1):
+            while node.next[level] is not None and position + node.width[level] <= target:
+                position += node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def _search(self, key) -> Tuple[List[_SkipNode], List[int]]:
+        path: List[_SkipNode] = [self._head] * MAX_SKIP_HEIGHT
+        positions = [0] * MAX_SKIP_HEIGHT
+        node = self._head
+        position = 0
+        for level in range(MAX_SKIP_HEIGHT - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            path[level] = node
+            positions[level] = position
+        return path, positions
+
+
+def _random_height() -> int:
+    height = 1
+    while height < MAX_SKIP_HEIGHT and random.random() < 0.5:
+        height += 1
+    return height
+
+
+class RankIndex:
+    """전체 사용자의 순위를 O(log n)에 구하는 순서 통계 구조
+
+    레벨별 인원은 펜윅 트리로, 같은 레벨 안의 (이름, id) 순서는 레벨별 OrderedKeys 로 관리합니다.
+    순위 = (나보다 레벨이 높은 인원) + (같은 레벨에서 내 앞의 인원) + 1
+    다른 워커의 변경을 반영하기 위한 주기적 재구축은 백그라운드 작업에서 하며,
+    재구축 중 들어온 변경은 새 구조로 교체한 뒤 다시 적용합니다.
+    """
+
+    def __init__(self, refresh_seconds: int, initial_levels: int = 128):
+        self.refresh_seconds = refresh_seconds
+        self._initial_levels = initial_levels
+        self._tree = FenwickTree(initial_levels)
+        self._buckets: Dict[int, OrderedKeys] = {}
+        self._users: Dict[int, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._pending: Optional[List[tuple]] = None  # 재구축 중 들어온 변경
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.rebuilds = 0
+        self.last_rebuild_seconds = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self._users)
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded_at is not None
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """heroes 전체로부터 구조를 다시 만듭니다. (시작 시, 그리고 백그라운드에서 주기적으로)"""
+        async with self._lock:
+            started = time.perf_counter()
+            self._pending = []
+            try:
+                result = await db.execute(_ranking_query())
+                rows = result.all()
+                # 정렬된 결과로 새 구조를 만드는 동안 이벤트 루프를 막지 않도록 스레드에서 실행
+                tree, buckets, users = await asyncio.to_thread(self._build, rows)
+            except BaseException:
+                self._pending = None
+                raise
+            pending, self._pending = self._pending, None
+            self._tree, self._buckets, self._users = tree, buckets, users
+            for args in pending:
+                self.update(*args)
+            self._loaded_at = time.monotonic()
+            self.rebuilds += 1
+            self.last_rebuild_seconds = time.perf_counter() - started
+
+    def _build(self, rows) -> Tuple[FenwickTree, Dict[int, OrderedKeys], Dict[int, dict]]:
+        users: Dict[int, dict] = {}
+        by_level: Dict[int, List[Tuple[str, int]]] = {}
+        for row in rows:
+            entry = _entry(row)
+            users[entry["id"]] = entry
+            # _ranking_query 가 (레벨 내림차순, 이름·id 오름차순)이라 레벨별로 이미 정렬된 순서로 쌓임
+            by_level.setdefault(entry["hero_level"], []).append((entry["name"] or "", entry["id"]))
+        size = self._initial_levels
+        while by_level and size <= max(by_level):
+            size *= 2
+        tree = FenwickTree(size)
+        buckets = {}
+        for level, keys in by_level.items():
+            buckets[level] = OrderedKeys.from_sorted(keys)
+            tree.add(level, len(keys))
+        return tree, buckets, users
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.rebuild(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("rank index rebuild failed")
+
+    def get(self, user_id: int) -> Optional[dict]:
+        return self._users.get(user_id)
+
+    def update(
+        self,
+        user_id: int,
+        level: int,
+        name: Optional[str] = None,
+        profile_img: Optional[str] = None,
+    ) -> Optional[dict]:
+        """사용자의 레벨을 반영하고 갱신된 항목을 반환합니다. 처음 보는 사용자인데 이름이 없으면 None."""
+        if self._pending is not None:
+            self._pending.append((user_id, level, name, profile_img))
+        level = max(level or 0, 0)
+        entry = self._users.get(user_id)
+        if entry is None and name is None:
+            return None
+        if entry is not None:
+            self._remove(user_id, entry)
+            entry = {
+                **entry,
+                "hero_level": level,
+                "name": entry["name"] if name is None else name,
+                "profile_img": entry["profile_img"] if profile_img is None else profile_img,
+            }
+        else:
+            entry = {"id": user_id, "name": name, "profile_img": profile_img, "hero_level": level}
+
+        if level >= self._tree.size:
+            self._grow(level)
+        bucket = self._buckets.get(level)
+        if bucket is None:
+            bucket = self._buckets[level] = OrderedKeys()
+        bucket.add(_bucket_key(entry))
+        self._tree.add(level, 1)
+        self._users[user_id] = entry
+        return entry
+
+    def rank(self, user_id: int) -> Optional[int]:
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        level = entry["hero_level"]
+        higher = self.total - self._tree.prefix_sum(level)
+        position = self._buckets[level].index(_bucket_key(entry))
+        return higher + position + 1
+
+    def neighbours(self, user_id: int) -> Tuple[Optional[dict], Optional[dict]]:
+        """바로 위 순위와 바로 아래 순위의 사용자를 반환합니다."""
+        entry = self._users[user_id]
+        level = entry["hero_level"]
+        bucket = self._buckets[level]
+        position = bucket.index(_bucket_key(entry))
+
+        if position > 0:
+            above = bucket[position - 1][1]
+        else:
+            # 나보다 레벨이 높은 사용자 중 가장 낮은 레벨의 마지막 사람
+            at_or_below = self._tree.prefix_sum(level)
+            above = None
+            if at_or_below < self.total:
+                above = self._buckets[self._tree.find_kth(at_or_below + 1)][-1][1]
+
+        if position + 1 < len(bucket):
+            below = bucket[position + 1][1]
+        else:
+            # 나보다 레벨이 낮은 사용자 중 가장 높은 레벨의 첫 사람
+            lower = self._tree.prefix_sum(level - 1) if level > 0 else 0
+            below = self._buckets[self._tree.find_kth(lower)][0][1] if lower else None
+
+        return (
+            self._users[above] if above is not None else None,
+            self._users[below] if below is not None else None,
+        )
+
+    def metrics(self) -> dict:
+        return {
+            "users": self.total,
+            "levels": len(self._buckets),
+            "rebuilds": self.rebuilds,
+            "last_rebuild_ms": round(self.last_rebuild_seconds * 1000, 2),
+        }
+
+    def _remove(self, user_id: int, entry: dict) -> None:
+        level = entry["hero_level"]
+        bucket = self._buckets[level]
+        bucket.remove(_bucket_key(entry))
+        if not len(bucket):
+            del self._buckets[level]
+        self._tree.add(level, -1)
+        del self._users[user_id]
+
+    def _grow(self, level: int) -> None:
+        size = self._tree.size
+        while size <= level:
+            size *= 2
+        tree = FenwickTree(size)
+        for bucket_level, bucket in self._buckets.items():
+            tree.add(bucket_level, len(bucket))
+        self._tree = tree
+
+
+def _bucket_key(entry: dict) -> Tuple[str, int]:
+    # 같은 레벨 안의 순서: rank_key 의 (이름, id) 부분과 같음
+    return (entry["name"] or "", entry["id"])
+
+
+def update_level(
+    user_id: int,
+    level: int,
+    name: Optional[str] = None,
+    profile_img: Optional[str] = None,
+) -> None:
+    """영웅 레벨 변경(또는 신규 영웅)을 랭킹 구조들에 반영합니다. 커밋 이후 호출합니다."""
+    entry = rank_index.update(user_id, level, name, profile_img)
+    if entry is not None:
+        name, profile_img = entry["name"], entry["profile_img"]
+    leaderboard.update_level(user_id, level, name, profile_img)
+
+
+def update_profile(user_id: int, profile_img: Optional[str]) -> None:
+    """프로필 이미지 변경을 랭킹 구조들에 반영합니다. 커밋 이후 호출합니다."""
+    entry = rank_index.get(user_id)
+    if entry is not None:
+        rank_index.update(user_id, entry["hero_level"], profile_img=profile_img)
+    leaderboard.update_profile(user_id, profile_img)
+
+
+_settings = get_settings()
+leaderboard = Leaderboard(
+    size=_settings.LEADERBOARD_CACHE_SIZE,
+    refresh_seconds=_settings.LEADERBOARD_REFRESH_SECONDS,
+)
+rank_index = RankIndex(refresh_seconds=_settings.RANK_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,131 @@
+# app/core/passwords.py
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..config import get_settings
+
+
+def create_context(rounds: int) -> CryptContext:
+    """bcrypt 비용(rounds)이 고정된 CryptContext 를 만듭니다.
+
+    min/max 를 같은 값으로 두어, 비용이 다른 기존 해시는 needs_update 가 True 가 됩니다.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+class PasswordHasherBusy(Exception):
+    """해싱 대기열이 가득 차 요청을 받을 수 없을 때 발생합니다. (503 으로 응답)"""
+
+
+class PasswordHasher:
+    """bcrypt 해싱·검증을 이벤트 루프 밖의 전용 스레드 풀에서 실행합니다.
+
+    bcrypt 는 계산 중 GIL 을 놓으므로 스레드로도 코어를 나눠 쓸 수 있습니다.
+    실행 중 + 대기 중인 작업이 max_pending 을 넘으면 기다리지 않고 PasswordHasherBusy 를 냅니다.
+    대량 가입용 해싱(hash_many)은 별도 풀(bulk_workers, 기본은 CPU 코어 수)에서 병렬로 실행해
+    로그인 대기열을 쓰지 않습니다.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int, bulk_workers: int = 1):
+        self.rounds = rounds
+        self.context = create_context(rounds)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.bulk_workers = bulk_workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._bulk_executor = ThreadPoolExecutor(
+            max_workers=bulk_workers, thread_name_prefix="password-hasher-bulk"
+        )
+        self._pending = 0
+        self.bulk_completed = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """여러 비밀번호를 대량 가입용 풀에서 해싱합니다.
+
+        로그인용 풀과 대기열(max_pending)을 쓰지 않으므로 로그인이 몰려도 중간에 PasswordHasherBusy 로
+        실패하지 않고, 대량 가입이 로그인 처리를 밀어내지도 않습니다.
+        """
+        loop = asyncio.get_running_loop()
+        hashes: List[str] = []
+        for start in range(0, len(passwords), self.bulk_workers):
+            window = passwords[start:start + self.bulk_workers]
+            hashes.extend(await asyncio.gather(*(
+                loop.run_in_executor(self._bulk_executor, self.context.hash, password) for password in window
+            )))
+            self.bulk_completed += len(window)
+        return hashes
+
+    async def verify(self, password: str, hashed: Optional[str]) -> bool:
+        valid, _ = await self.verify_and_update(password, hashed)
+        return valid
+
+    async def verify_and_update(
+        self, password: str, hashed: Optional[str]
+    ) -> Tuple[bool, Optional[str]]:
+        """비밀번호를 검증하고, 비용이 바뀐 해시면 새 해시를 함께 반환합니다."""
+        if not hashed:
+            return False, None
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "bulk_workers": self.bulk_workers,
+            "bulk_completed": self.bulk_completed,
+            "avg_ms": round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "rounds": self.rounds,
+        }
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._pending -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(
+    rounds=_settings.BCRYPT_ROUNDS,
+    workers=_settings.PASSWORD_HASH_WORKERS,
+    max_pending=_settings.PASSWORD_HASH_MAX_PENDING,
+    bulk_workers=_settings.PASSWORD_HASH_BULK_WORKERS or os.cpu_count() or 1,
+)
+pwd_context = password_hasher.context
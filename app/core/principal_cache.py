@@ -0,0 +1,72 @@
+# app/core/principal_cache.py
+
+import time
+from typing import Any, Dict, Set, Tuple
+
+from ..config import get_settings
+from .cache import LRUCache
+
+# (토큰 subject, 만료 시각) — 같은 로그인으로 발급된 토큰은 같은 키를 공유
+PrincipalKey = Tuple[str, int]
+
+
+class PrincipalCache:
+    """인증된 사용자(principal) 캐시
+
+    get_current_user 가 요청마다 users 를 이메일로 조회하지 않도록, 토큰의 (sub, exp) 를 키로
+    조회 결과(컬럼 값)를 TTL 동안 보관합니다. 항목은 토큰 만료 시각을 넘겨 살아있지 않습니다.
+    사용자 레코드가 바뀌면 invalidate_user 로 그 사용자의 항목을 모두 지웁니다.
+    사용자별 키 목록은 항목이 만료·퇴출되면 함께 정리됩니다.
+    """
+
+    def __init__(self, local: LRUCache):
+        self.local = local
+        self.local.on_remove = self._forget_key
+        self._user_keys: Dict[int, Set[PrincipalKey]] = {}
+        self._key_users: Dict[PrincipalKey, int] = {}
+        self.invalidations = 0
+
+    def get(self, subject: str, expires_at: int) -> Any:
+        return self.local.get((subject, expires_at))
+
+    def set(self, subject: str, expires_at: int, user_id: int, value: Any) -> None:
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return
+        key = (subject, expires_at)
+        ttl = min(self.local.ttl, remaining) if self.local.ttl is not None else remaining
+        self.local.set(key, value, ttl=ttl)
+        if key in self.local:
+            self._user_keys.setdefault(user_id, set()).add(key)
+            self._key_users[key] = user_id
+
+    def invalidate_user(self, user_id: int) -> None:
+        """사용자의 캐시 항목을 지웁니다. 사용자 정보(비밀번호·프로필 등) 변경을 커밋한 뒤 호출합니다."""
+        self.invalidations += 1
+        for key in list(self._user_keys.get(user_id, ())):
+            self.local.delete(key)
+
+    def _forget_key(self, key: PrincipalKey) -> None:
+        user_id = self._key_users.pop(key, None)
+        keys = self._user_keys.get(user_id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._user_keys[user_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.local.metrics(), "invalidations": self.invalidations}
+
+
+def _create_principal_cache() -> PrincipalCache:
+    settings = get_settings()
+    return PrincipalCache(
+        LRUCache(
+            max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+    )
+
+
+principal_cache = _create_principal_cache()
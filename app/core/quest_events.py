@@ -0,0 +1,103 @@
+# app/core/quest_events.py
+#
+# 퀘스트 완료(quest_completed) 이벤트 핸들러
+# 클리어 요청은 완료 플래그·일별 집계·능력치만 기록하고 바로 응답하며, 나머지 파생 작업은 여기서 처리합니다.
+
+from typing import Dict, List
+
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from . import coins, leaderboard
+from .events import event_bus
+from .quest_ops import QUEST_COMPLETED
+from .statistics_engine import XP_PER_QUEST, level_for_xp
+from .stats_cache import stats_cache
+
+
+def _user_ids(events: List[dict]) -> List[int]:
+    return sorted({event["user_id"] for event in events})
+
+
+async def reward_coins(db: AsyncSession, events: List[dict]):
+    """완료한 퀘스트 수만큼 코인을 지급합니다. (사용자별 합산 후 한 UPDATE 문)
+
+    QUEST_SERVER_REWARDS 가 꺼져 있으면 클라이언트가 /hero/reward 로 지급하므로 건너뜁니다.
+    """
+    settings = get_settings()
+    if settings.QUEST_SERVER_REWARDS and settings.QUEST_COMPLETION_COIN:
+        amount = settings.QUEST_COMPLETION_COIN
+        await coins.add_many(db, [(event["user_id"], amount) for event in events])
+
+
+async def grant_levels(db: AsyncSession, events: List[dict]):
+    """누적 완료 경험치로 도달한 레벨까지 영웅 레벨을 올립니다. (내리지는 않음)
+
+    QUEST_SERVER_REWARDS 가 꺼져 있으면 클라이언트가 /hero/level-up 으로 올리므로 건너뜁니다.
+    """
+    if not get_settings().QUEST_SERVER_REWARDS:
+        return None
+    quest = models.Quest
+    hero = models.Hero
+    result = await db.execute(
+        select(quest.user_id, func.count().label("completed"))
+        .filter(quest.user_id.in_(_user_ids(events)), quest.finish == True)
+        .group_by(quest.user_id)
+    )
+    levels: Dict[int, int] = {}
+    for row in result.all():
+        level = level_for_xp(int(row.completed) * XP_PER_QUEST)
+        updated = await db.execute(
+            update(hero)
+            .filter(hero.user_id == row.user_id, hero.hero_level < level)
+            .values(hero_level=level)
+            .execution_options(synchronize_session=False)
+        )
+        if updated.rowcount:
+            levels[row.user_id] = level
+
+    async def update_rankings():
+        for user_id, level in levels.items():
+            leaderboard.update_level(user_id, level)
+
+    return update_rankings if levels else None
+
+
+async def notify_friends(db: AsyncSession, events: List[dict]):
+    """완료한 사용자를 친구로 추가한 사용자들에게 알림을 남깁니다. (이벤트당 INSERT ... SELECT 한 번)"""
+    notification = models.Notification
+    friend = models.Friend
+    user = models.User
+    for event in events:
+        await db.execute(
+            notification.__table__.insert().from_select(
+                ["user_id", "contents", "type", "related_id"],
+                select(
+                    friend.user_id,
+                    func.concat(user.name, "님이 퀘스트를 완료했습니다."),
+                    literal(QUEST_COMPLETED),
+                    literal(event["quest_id"]),
+                )
+                .join(user, user.id == friend.friend_user_id)
+                .filter(friend.friend_user_id == event["user_id"])
+            )
+        )
+
+
+async def invalidate_stats(db: AsyncSession, events: List[dict]):
+    """코인·레벨이 바뀌었으므로 커밋 이후 사용자의 통계 캐시를 무효화합니다."""
+    user_ids = _user_ids(events)
+
+    async def invalidate():
+        for user_id in user_ids:
+            await stats_cache.invalidate_user(user_id)
+
+    return invalidate
+
+
+event_bus.subscribe(QUEST_COMPLETED, reward_coins)
+event_bus.subscribe(QUEST_COMPLETED, grant_levels)
+event_bus.subscribe(QUEST_COMPLETED, notify_friends)
+event_bus.subscribe(QUEST_COMPLETED, invalidate_stats)
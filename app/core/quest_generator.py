@@ -0,0 +1,207 @@
+# app/core/quest_generator.py
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 태그 없이 요청했을 때 쓰는 풀
+GENERAL_POOL = ""
+
+
+class QuestGenerator(ABC):
+    """AI 퀘스트 생성기 인터페이스 (예: LLM 호출)
+
+    generate 는 {"title", "description", "tag": [태그]} 목록을 반환합니다.
+    """
+
+    @abstractmethod
+    async def generate(self, tag: str, count: int) -> List[dict]:
+        ...
+
+
+# 로컬 생성기용 태그별 퀘스트 문구 (제목, 설명)
+LOCAL_TEMPLATES: Dict[str, List[Tuple[str, str]]] = {
+    "운동 및 스포츠": [
+        ("30분 걷기", "오늘 30분 이상 걸어보세요."),
+        ("스쿼트 50개", "스쿼트 50개를 나눠서라도 완료해보세요."),
+        ("계단 오르기", "엘리베이터 대신 계단을 이용해보세요."),
+    ],
+    "공부": [
+        ("집중 공부 50분", "방해 요소를 치우고 50분 동안 집중해서 공부해보세요."),
+        ("오늘 배운 내용 정리", "오늘 배운 내용을 세 줄로 정리해보세요."),
+        ("단어 20개 암기", "새로운 단어 20개를 외워보세요."),
+    ],
+    "자기개발": [
+        ("독서 20쪽", "읽고 싶던 책을 20쪽 읽어보세요."),
+        ("내일 계획 세우기", "내일 할 일 세 가지를 미리 적어보세요."),
+        ("새로운 기술 찾아보기", "배워보고 싶은 기술을 하나 찾아 10분간 알아보세요."),
+    ],
+    "취미": [
+        ("그림 한 장", "15분 동안 자유롭게 그림을 그려보세요."),
+        ("좋아하는 노래 연습", "좋아하는 노래 한 곡을 연습해보세요."),
+        ("사진 세 장 찍기", "주변에서 마음에 드는 장면 세 가지를 찍어보세요."),
+    ],
+    "명상 및 스트레칭": [
+        ("5분 명상", "조용한 곳에서 5분 동안 호흡에 집중해보세요."),
+        ("전신 스트레칭", "10분 동안 전신 스트레칭을 해보세요."),
+        ("잠들기 전 이완", "잠들기 전 몸의 긴장을 천천히 풀어보세요."),
+    ],
+    GENERAL_POOL: [
+        ("물 8잔 마시기", "오늘 물을 8잔 이상 마셔보세요."),
+        ("방 정리 10분", "10분 동안 주변을 정리해보세요."),
+        ("감사한 일 기록", "오늘 감사했던 일 세 가지를 적어보세요."),
+    ],
+}
+
+
+class LocalQuestGenerator(QuestGenerator):
+    """외부 모델 대신 쓰는 결정적(deterministic) 생성기 (테스트·로컬 개발용)
+
+    태그별 문구를 순서대로 돌려가며 내보내므로 같은 순서로 호출하면 항상 같은 결과가 나옵니다.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+
+    async def generate(self, tag: str, count: int) -> List[dict]:
+        templates = LOCAL_TEMPLATES.get(tag) or LOCAL_TEMPLATES[GENERAL_POOL]
+        start = self._counters.get(tag, 0)
+        self._counters[tag] = start + count
+        quests = []
+        for index in range(start, start + count):
+            title, description = templates[index % len(templates)]
+            quests.append({"title": title, "description": description, "tag": [tag] if tag else []})
+        return quests
+
+
+def create_generator(name: Optional[str]) -> QuestGenerator:
+    if not name or name == "local":
+        return LocalQuestGenerator()
+    raise ValueError(f"Unknown AI_QUEST_GENERATOR: {name}")
+
+
+class QuestPool:
+    """태그별로 미리 생성해 둔 AI 퀘스트 풀
+
+    claim 은 풀 앞에서 하나를 꺼내는 O(1) 연산이라 요청 경로에 생성 지연이 없습니다.
+    풀이 절반 아래로 줄면 백그라운드에서 size 까지 다시 채우며(동시 생성 수는 refill_concurrency 로 제한),
+    생성된 지 stale_seconds 가 지난 퀘스트는 버립니다. 풀이 비어 있을 때만 요청 경로에서 직접 생성합니다.
+    """
+
+    def __init__(
+        self,
+        generator: QuestGenerator,
+        tags: List[str],
+        size: int,
+        refill_concurrency: int,
+        stale_seconds: float,
+    ):
+        self.generator = generator
+        self.tags = [GENERAL_POOL, *tags]
+        self.size = size
+        self.stale_seconds = stale_seconds
+        self._pools: Dict[str, Deque[Tuple[float, dict]]] = {tag: deque() for tag in self.tags}
+        self._refilling: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(refill_concurrency)
+        self.claims = 0
+        self.misses = 0
+        self.stale_dropped = 0
+        self.generated = 0
+        self.refill_errors = 0
+
+    def supports(self, tag: str) -> bool:
+        return tag in self._pools
+
+    async def claim(self, tag: str = GENERAL_POOL) -> dict:
+        """풀에서 퀘스트 하나를 꺼냅니다. 풀이 비었으면 직접 생성합니다."""
+        pool = self._pools[tag]
+        now = time.monotonic()
+        quest = None
+        while pool:
+            generated_at, candidate = pool.popleft()
+            if now - generated_at < self.stale_seconds:
+                quest = candidate
+                break
+            self.stale_dropped += 1
+
+        self.claims += 1
+        if len(pool) < self.size // 2:
+            self._schedule_refill(tag)
+        if quest is None:
+            self.misses += 1
+            quest = (await self.generator.generate(tag, 1))[0]
+            self.generated += 1
+        return quest
+
+    def start(self) -> None:
+        """모든 풀을 백그라운드에서 채우기 시작합니다."""
+        for tag in self.tags:
+            self._schedule_refill(tag)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._refilling.clear()
+
+    def _schedule_refill(self, tag: str) -> None:
+        if tag in self._refilling:
+            return
+        self._refilling.add(tag)
+        task = asyncio.create_task(self._refill(tag))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill(self, tag: str) -> None:
+        try:
+            async with self._semaphore:
+                missing = self.size - len(self._pools[tag])
+                if missing <= 0:
+                    return
+                quests = await self.generator.generate(tag, missing)
+                now = time.monotonic()
+                self._pools[tag].extend((now, quest) for quest in quests)
+                self.generated += len(quests)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.refill_errors += 1
+            logger.exception("AI quest pool refill failed for tag %r", tag)
+        finally:
+            self._refilling.discard(tag)
+
+    def metrics(self) -> dict:
+        return {
+            "generator": type(self.generator).__name__,
+            "size": self.size,
+            "pools": {tag or "general": len(pool) for tag, pool in self._pools.items()},
+            "refilling": len(self._refilling),
+            "claims": self.claims,
+            "misses": self.misses,
+            "stale_dropped": self.stale_dropped,
+            "generated": self.generated,
+            "refill_errors": self.refill_errors,
+        }
+
+
+def _create_quest_pool() -> QuestPool:
+    settings = get_settings()
+    return QuestPool(
+        create_generator(settings.AI_QUEST_GENERATOR),
+        tags=settings.AI_QUEST_TAGS,
+        size=settings.AI_QUEST_POOL_SIZE,
+        refill_concurrency=settings.AI_QUEST_POOL_REFILL_CONCURRENCY,
+        stale_seconds=settings.AI_QUEST_POOL_STALE_SECONDS,
+    )
+
+
+quest_pool = _create_quest_pool()
@@ -0,0 +1,119 @@
+# app/core/quest_ops.py
+
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .. import models
+from . import daily_activity, hero_stats, quest_tags
+from .events import event_bus
+
+QUEST_COMPLETED = "quest_completed"
+
+
+async def create_quests(db: AsyncSession, user_id: int, items: Sequence[Dict]) -> List[models.Quest]:
+    """퀘스트 여러 개를 만들고 태그 인덱스도 함께 기록합니다.
+
+    items: {"title", "description", "tag"(리스트), "quest_type"} 목록.
+    다중 행 INSERT 의 id 는 innodb_autoinc_lock_mode=2 나 auto_increment_increment 설정에 따라
+    연속된다는 보장이 없으므로, ORM flush 로 행마다 실제 id 를 받아 태그 인덱스에 씁니다.
+    (quest_tags 는 다중 행 INSERT 한 번) 호출한 쪽의 트랜잭션 안에서 실행됩니다.
+    """
+    rows = []
+    for item in items:
+        tags = quest_tags.normalize_tags(item.get("tag") or [])
+        rows.append({
+            "user_id": user_id,
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "tag": json.dumps(tags, ensure_ascii=False) if tags else None,
+            "quest_type": item.get("quest_type", "self"),
+            "finish": False,
+        })
+    if not rows:
+        return []
+
+    quests = [models.Quest(**row) for row in rows]
+    db.add_all(quests)
+    await db.flush()
+    await quest_tags.add_quest_tags(db, quests)
+    return quests
+
+
+async def lock_quests(
+    db: AsyncSession, quest_ids: Sequence[int], user_id: Optional[int] = None
+) -> Dict[int, models.Quest]:
+    """퀘스트들을 행 잠금(SELECT ... FOR UPDATE)과 함께 읽습니다. (id → 퀘스트)
+
+    동시에 같은 퀘스트를 완료·삭제해도 집계가 두 번 반영되지 않도록 완료 여부는 잠근 뒤 확인합니다.
+    user_id 를 주면 그 사용자의 퀘스트만 읽습니다.
+    """
+    if not quest_ids:
+        return {}
+    query = (
+        select(models.Quest)
+        .filter(models.Quest.id.in_(quest_ids))
+        .order_by(models.Quest.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    if user_id is not None:
+        query = query.filter(models.Quest.user_id == user_id)
+    result = await db.execute(query)
+    return {quest.id: quest for quest in result.scalars().all()}
+
+
+async def complete_quests(db: AsyncSession, quests: Sequence[models.Quest], finished_at: datetime) -> None:
+    """미완료 퀘스트들을 UPDATE ... WHERE id IN (...) 한 번으로 완료 처리하고,
+    일별 집계와 영웅 능력치, quest_completed 이벤트를 같은 트랜잭션에서 기록합니다.
+    마감이 지나 expired 로 표시된 퀘스트도 늦게나마 완료하면 expired 를 해제합니다.
+    """
+    if not quests:
+        return
+    await db.execute(
+        update(models.Quest)
+        .filter(models.Quest.id.in_([quest.id for quest in quests]))
+        .values(finish=True, finish_time=finished_at, expired=False)
+        .execution_options(synchronize_session=False)
+    )
+    # 세션의 객체에도 반영 (변경으로 잡히지 않게 커밋된 값으로 설정)
+    for quest in quests:
+        set_committed_value(quest, "finish", True)
+        set_committed_value(quest, "finish_time", finished_at)
+        set_committed_value(quest, "expired", False)
+    await daily_activity.record_completions(db, quests)
+    await hero_stats.record_completions(db, quests)
+    # 코인·레벨·알림 등은 커밋 이후 이벤트 워커가 처리 (아웃박스에 같은 트랜잭션으로 기록)
+    await event_bus.publish(db, QUEST_COMPLETED, [
+        {
+            "quest_id": quest.id,
+            "user_id": quest.user_id,
+            "quest_type": quest.quest_type,
+            "finished_at": finished_at.isoformat(),
+        }
+        for quest in quests
+    ])
+
+
+async def remove_quests(db: AsyncSession, quests: Sequence[models.Quest]) -> None:
+    """퀘스트들을 DELETE ... WHERE id IN (...) 한 번으로 지웁니다.
+
+    완료된 퀘스트는 일별 집계와 영웅 능력치에서 되돌리고, 태그 인덱스도 함께 지웁니다.
+    """
+    if not quests:
+        return
+    finished = [quest for quest in quests if quest.finish]
+    if finished:
+        await daily_activity.revert_completions(db, finished)
+        await hero_stats.record_completions(db, finished, sign=-1)
+    quest_ids = [quest.id for quest in quests]
+    await quest_tags.delete_quest_tags(db, quest_ids)
+    await db.execute(
+        delete(models.Quest)
+        .filter(models.Quest.id.in_(quest_ids))
+        .execution_options(synchronize_session=False)
+    )
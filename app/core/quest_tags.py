@@ -0,0 +1,114 @@
+# app/core/quest_tags.py
+
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..database import AsyncSessionLocal
+from .utils import parse_tags
+
+# 태그 길이 제한 (quest_tags.tag 컬럼 길이)
+MAX_TAG_LENGTH = 50
+# 재구축 시 한 번에 INSERT 하는 행 수
+REBUILD_BATCH_SIZE = 1000
+
+
+def _tag_identity(tag: str) -> str:
+    """quest_tags.tag 콜레이션(utf8mb4_0900_ai_ci)처럼 대소문자·악센트를 무시한 비교용 값"""
+    decomposed = unicodedata.normalize("NFKD", tag)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def normalize_tags(tags: Iterable[str]) -> List[str]:
+    """공백 제거, 중복 제거, 길이 제한을 적용한 태그 목록을 반환합니다. (순서 유지)
+
+    (quest_id, tag) 기본 키는 대소문자·악센트를 구분하지 않으므로 중복도 같은 기준으로 판단하고,
+    처음 나온 표기를 남깁니다. ("A", "a" → "A")
+    """
+    normalized = []
+    seen = set()
+    for tag in tags:
+        tag = tag.strip()[:MAX_TAG_LENGTH]
+        identity = _tag_identity(tag)
+        if tag and identity not in seen:
+            seen.add(identity)
+            normalized.append(tag)
+    return normalized
+
+
+async def set_quest_tags(db: AsyncSession, quest) -> None:
+    """퀘스트의 태그 인덱스를 quest.tag 기준으로 다시 씁니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다."""
+    await db.execute(delete(models.QuestTag).filter(models.QuestTag.quest_id == quest.id))
+    rows = [
+        {"quest_id": quest.id, "user_id": quest.user_id, "tag": tag}
+        for tag in normalize_tags(parse_tags(quest.tag))
+    ]
+    if rows:
+        await db.execute(insert(models.QuestTag), rows)
+
+
+async def add_quest_tags(db: AsyncSession, quests: Iterable) -> None:
+    """새로 만든 퀘스트들의 태그 인덱스를 다중 행 INSERT 로 기록합니다."""
+    rows = [
+        {"quest_id": quest.id, "user_id": quest.user_id, "tag": tag}
+        for quest in quests
+        for tag in normalize_tags(parse_tags(quest.tag))
+    ]
+    if rows:
+        await db.execute(insert(models.QuestTag), rows)
+
+
+async def delete_quest_tags(db: AsyncSession, quest_ids: Iterable[int]) -> None:
+    """삭제되는 퀘스트들의 태그 인덱스를 지웁니다."""
+    quest_ids = list(quest_ids)
+    if quest_ids:
+        await db.execute(delete(models.QuestTag).filter(models.QuestTag.quest_id.in_(quest_ids)))
+
+
+async def fetch_tag_counts(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """(user_id, tag) 인덱스만 읽는 GROUP BY 로 사용자의 태그별 퀘스트 수를 가져옵니다."""
+    result = await db.execute(
+        select(models.QuestTag.tag, func.count().label("count"))
+        .filter(models.QuestTag.user_id == user_id)
+        .group_by(models.QuestTag.tag)
+    )
+    return {row.tag: int(row.count) for row in result.all()}
+
+
+async def rebuild_quest_tags(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """quests.tag 로부터 태그 인덱스를 다시 만듭니다. (user_id 가 없으면 전체) 생성한 행 수를 반환합니다."""
+    cleanup = delete(models.QuestTag)
+    query = (
+        select(models.Quest.id, models.Quest.user_id, models.Quest.tag)
+        .filter(models.Quest.tag.isnot(None))
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    if user_id is not None:
+        cleanup = cleanup.filter(models.QuestTag.user_id == user_id)
+        query = query.filter(models.Quest.user_id == user_id)
+
+    await db.execute(cleanup)
+
+    written = 0
+    pending = []
+    # 스트리밍 중인 연결에서는 다른 쿼리를 실행할 수 없으므로 읽기용 세션을 따로 사용
+    async with AsyncSessionLocal() as reader:
+        stream = await reader.stream(query)
+        async for row in stream:
+            pending.extend(
+                {"quest_id": row.id, "user_id": row.user_id, "tag": tag}
+                for tag in normalize_tags(parse_tags(row.tag))
+            )
+            if len(pending) >= REBUILD_BATCH_SIZE:
+                await db.execute(insert(models.QuestTag), pending)
+                written += len(pending)
+                pending = []
+
+    if pending:
+        await db.execute(insert(models.QuestTag), pending)
+        written += len(pending)
+    await db.commit()
+    return written
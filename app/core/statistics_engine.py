@@ -0,0 +1,336 @@
+# app/core/statistics_engine.py
+
+import asyncio
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..database import AsyncSessionLocal
+
+# 월간 목표 (월 100개 퀘스트 완료)
+MONTHLY_TARGET = 100
+# 퀘스트 1개당 경험치 (레벨 진행률 계산용)
+XP_PER_QUEST = 10
+# 기간 통계의 집계 단위별 (퀘스트당 획득 경험치, 목표 1회 달성에 필요한 퀘스트 수) (예시)
+BUCKET_RULES = {
+    "day": (350, 1),
+    "week": (300, 3),
+    "month": (250, 10),
+}
+# 한 번에 조회할 수 있는 최대 기간 (일)
+MAX_PERIOD_DAYS = 3660
+
+
+async def run_sections(
+    db: AsyncSession,
+    sections: Dict[str, Callable[[AsyncSession], Awaitable[Any]]],
+    concurrent: bool = False,
+    max_concurrency: int = 1,
+) -> Dict[str, Any]:
+    """서로 독립적인 통계 섹션들을 실행해 {이름: 결과}를 반환합니다.
+
+    concurrent 이면 섹션마다 풀에서 별도 세션을 받아 asyncio.gather 로 동시에 실행하고,
+    한 요청이 풀을 독점하지 않도록 동시에 쓰는 세션 수를 max_concurrency 로 제한합니다.
+    아니면 요청 세션 하나로 차례대로 실행합니다.
+    """
+    if not concurrent:
+        return {name: await section(db) for name, section in sections.items()}
+
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def run(section: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            async with AsyncSessionLocal() as session:
+                return await section(session)
+
+    results = await asyncio.gather(*(run(section) for section in sections.values()))
+    return dict(zip(sections.keys(), results))
+
+
+def day_start(value: datetime) -> datetime:
+    """주어진 시각이 속한 날의 00:00 을 반환합니다."""
+    return datetime(value.year, value.month, value.day)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """value 가 속한 달의 1일에서 months 만큼 이동한 달의 1일을 반환합니다. (연도 경계 처리)"""
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """해당 월의 반열린 구간 [1일 00:00, 다음 달 1일 00:00) 을 반환합니다."""
+    start = datetime(year, month, 1)
+    return start, add_months(start, 1)
+
+
+def parse_month(value: str) -> Tuple[int, int]:
+    """'YYYY-MM' 문자열을 (연, 월)로 변환합니다. 형식이 잘못되면 ValueError 를 발생시킵니다."""
+    parsed = datetime.strptime(value, "%Y-%m")
+    return parsed.year, parsed.month
+
+
+async def fetch_quest_summary(db: AsyncSession, user_id: int, now: datetime) -> Dict[str, float]:
+    """요약 섹션에 필요한 수치를 인덱스만 읽는 집계 쿼리 두 번으로 가져옵니다.
+
+    - 총/완료/이번 달 완료 수: idx_quests_user_finish_time (user_id, finish, finish_time)
+    - 최근 7일 평균 활동 시간: idx_quests_user_start_time (user_id, start_time, progress_time) 범위 검색
+    """
+    seven_days_ago = now - timedelta(days=7)
+    start_of_month = datetime(now.year, now.month, 1)
+
+    quest = models.Quest
+    counts = (
+        await db.execute(
+            select(
+                func.count().label("total"),
+                func.coalesce(
+                    func.sum(case((quest.finish == True, 1), else_=0)), 0
+                ).label("completed"),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            ((quest.finish == True) & (quest.finish_time >= start_of_month), 1),
+                            else_=0,
+                        )
+                    ),
+                    0,
+                ).label("monthly_completed"),
+            ).filter(quest.user_id == user_id)
+        )
+    ).one()
+
+    avg_progress = (
+        await db.execute(
+            select(func.avg(quest.progress_time)).filter(
+                quest.user_id == user_id,
+                quest.start_time >= seven_days_ago,
+            )
+        )
+    ).scalar_one()
+
+    return {
+        "total": int(counts.total or 0),
+        "completed": int(counts.completed or 0),
+        "avg_progress": float(avg_progress or 0),
+        "monthly_completed": int(counts.monthly_completed or 0),
+    }
+
+
+async def fetch_daily_completions(
+    db: AsyncSession, user_id: int, start: datetime, end: datetime
+) -> Dict[date, int]:
+    """[start, end) 구간의 일별 완료 퀘스트 수를 일별 집계 테이블에서 가져옵니다. (구간은 자정 기준)"""
+    activity = models.UserDailyActivity
+    result = await db.execute(
+        select(activity.activity_date, activity.completed_count).filter(
+            activity.user_id == user_id,
+            activity.activity_date >= start.date(),
+            activity.activity_date < end.date(),
+            activity.completed_count > 0,
+        )
+    )
+    return {row.activity_date: int(row.completed_count) for row in result.all()}
+
+
+async def fetch_completed_quest_times(
+    db: AsyncSession, user_id: int, start: datetime, end: datetime
+) -> List[Tuple[int, datetime]]:
+    """[start, end) 구간에 완료된 퀘스트의 (id, 완료 시각)을 완료 시각 순으로 한 번에 가져옵니다."""
+    result = await db.execute(
+        select(models.Quest.id, models.Quest.finish_time)
+        .filter(
+            models.Quest.user_id == user_id,
+            models.Quest.finish == True,
+            models.Quest.finish_time >= start,
+            models.Quest.finish_time < end,
+        )
+        .order_by(models.Quest.finish_time, models.Quest.id)
+    )
+    return [(row.id, row.finish_time) for row in result.all()]
+
+
+async def fetch_completion_dates(db: AsyncSession, user_id: int) -> List[date]:
+    """퀘스트를 완료한 날짜들을 일별 집계 테이블에서 최신순으로 한 번에 가져옵니다."""
+    activity = models.UserDailyActivity
+    result = await db.execute(
+        select(activity.activity_date)
+        .filter(activity.user_id == user_id, activity.completed_count > 0)
+        .order_by(activity.activity_date.desc())
+    )
+    return [row.activity_date for row in result.all()]
+
+
+def compute_streaks(dates: Iterable[date], today: date) -> Tuple[int, int]:
+    """최신순으로 정렬된 완료 날짜들을 한 번 훑어 (현재 연속 일수, 최장 연속 일수)를 구합니다.
+
+    현재 연속 일수는 오늘부터 거슬러 올라가며 끊기지 않은 일수입니다.
+    """
+    current = longest = run = 0
+    previous = None
+    in_current = False
+
+    for day in dates:
+        if day > today:
+            continue
+        if previous is not None and previous - day == timedelta(days=1):
+            run += 1
+        else:
+            # 첫 구간이 오늘에서 시작할 때만 현재 연속 일수로 인정
+            in_current = previous is None and day == today
+            run = 1
+        if in_current:
+            current = run
+        longest = max(longest, run)
+        previous = day
+
+    return current, longest
+
+
+def build_summary(
+    aggregate: Dict[str, float],
+    hero_level: Optional[int],
+    streak_days: int,
+    longest_streak_days: int = 0,
+) -> Dict[str, float]:
+    """집계 결과로부터 요약 섹션을 만듭니다. (hero_level 이 비어 있으면 1레벨로 취급)"""
+    completed = aggregate["completed"]
+    hero_level = hero_level or 1
+
+    # 경험치는 현재 레벨 기준으로 계산 (예시)
+    total_xp = hero_level * 1000
+
+    # 최근 7일 평균 활동 시간 (초 → 시간)
+    avg_daily_activity_hours = round(aggregate["avg_progress"] / 3600, 1)
+
+    # 월간 목표 달성률 (최대 100%)
+    monthly_goal_percentage = min(
+        int((aggregate["monthly_completed"] / MONTHLY_TARGET) * 100), 100
+    )
+
+    return {
+        "totalQuests": aggregate["total"],
+        "completedQuests": completed,
+        "totalXp": total_xp,
+        "avg_daily_activity": avg_daily_activity_hours,
+        "streakDays": streak_days,
+        "longestStreakDays": max(longest_streak_days, streak_days),
+        "monthly_goal_percentage": monthly_goal_percentage,
+        "level_progress_percentage": level_progress_percentage(hero_level, completed),
+    }
+
+
+def level_for_xp(xp: int) -> int:
+    """누적 경험치로 도달한 레벨을 계산합니다. (레벨 L 에 필요한 경험치: L^2 * 100, 최소 1)"""
+    return max(math.isqrt(max(xp, 0) // 100), 1)
+
+
+def level_progress_percentage(current_level: Optional[int], completed_quests: int) -> int:
+    """레벨업 진행률을 계산합니다. (다음 레벨 필요 경험치: 레벨^2 * 100)"""
+    current_level = current_level or 1
+    next_level_xp = (current_level + 1) ** 2 * 100
+    current_level_xp = current_level ** 2 * 100
+    xp_needed = next_level_xp - current_level_xp
+
+    current_xp = completed_quests * XP_PER_QUEST
+    current_level_progress = current_xp - current_level_xp
+    return min(int((current_level_progress / xp_needed) * 100), 99)
+
+
+def activity_level(count: int) -> int:
+    """완료 수에 따른 활동 레벨(0-3)을 반환합니다."""
+    if count <= 0:
+        return 0
+    if count <= 2:
+        return 1
+    if count <= 4:
+        return 2
+    return 3
+
+
+def build_calendar(
+    completed: Iterable[Tuple[int, datetime]], start: datetime, end: datetime
+) -> List[dict]:
+    """완료 퀘스트 목록을 날짜별로 묶어 [start, end) 의 캘린더 데이터를 만듭니다."""
+    quest_ids_by_day: Dict[date, List[str]] = {}
+    for quest_id, finish_time in completed:
+        quest_ids_by_day.setdefault(finish_time.date(), []).append(str(quest_id))
+
+    calendar_data = []
+    current = start.date()
+    while current < end.date():
+        quest_ids = quest_ids_by_day.get(current, [])
+        calendar_data.append({
+            "date": current.strftime('%Y-%m-%d'),
+            "activityLevel": activity_level(len(quest_ids)),
+            "completedQuestIds": quest_ids,
+        })
+        current += timedelta(days=1)
+    return calendar_data
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """날짜가 속한 집계 구간의 시작일을 반환합니다. (주는 월요일 시작)"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket_start(start: date, granularity: str) -> date:
+    """다음 집계 구간의 시작일을 반환합니다."""
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return add_months(datetime(start.year, start.month, 1), 1).date()
+    return start + timedelta(days=1)
+
+
+def bucket_label(start: date, granularity: str) -> str:
+    """집계 구간의 기본 라벨 (일/주: 시작일, 월: YYYY-MM)"""
+    if granularity == "month":
+        return start.strftime('%Y-%m')
+    return start.strftime('%Y-%m-%d')
+
+
+def build_buckets(
+    daily_counts: Dict[date, int], start: date, end: date, granularity: str
+) -> List[dict]:
+    """일별 완료 수를 [start, end) 구간의 단위별 버킷으로 접고, 활동이 없는 버킷은 0으로 채웁니다."""
+    xp_per_quest, goal_unit = BUCKET_RULES[granularity]
+
+    counts: Dict[date, int] = {}
+    for day, count in daily_counts.items():
+        if start <= day < end:
+            key = bucket_start(day, granularity)
+            counts[key] = counts.get(key, 0) + count
+
+    buckets = []
+    current = bucket_start(start, granularity)
+    while current < end:
+        completed_quests = counts.get(current, 0)
+        buckets.append({
+            "date": bucket_label(current, granularity),
+            "completedQuests": completed_quests,
+            "earnedXp": completed_quests * xp_per_quest,  # 획득한 경험치 (예시)
+            "goalAchievement": min(completed_quests // goal_unit, 7),  # 목표 달성 수 (예시)
+        })
+        current = next_bucket_start(current, granularity)
+    return buckets
+
+
+async def aggregate_buckets(
+    db: AsyncSession, user_id: int, start: datetime, end: datetime, granularity: str
+) -> List[dict]:
+    """[start, end) 구간의 단위별 버킷 목록을 반환합니다.
+
+    quests 를 직접 집계하지 않고 일별 집계 테이블(user_daily_activity)의 구간 행을 읽어 묶으므로,
+    기존 완료 이력은 python -m app.cli backfill-daily-activity 로 채워져 있어야 합니다.
+    """
+    daily_counts = await fetch_daily_completions(db, user_id, start, end)
+    return build_buckets(daily_counts, start.date(), end.date(), granularity)
@@ -0,0 +1,114 @@
+# app/core/stats_cache.py
+
+import json
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..config import get_settings
+from .cache import MISSING, CacheBackend, LocalCacheBackend, LRUCache
+
+
+class StatsCache:
+    """사용자·섹션별 통계 응답 캐시
+
+    공유 백엔드가 있으면 키에 백엔드의 사용자별 세대(generation) 번호를 넣어, 퀘스트가 바뀌면 세대만 올려
+    모든 워커의 캐시를 한 번에 무효화합니다. 백엔드가 없으면 무효화할 때 그 사용자의 로컬 항목을 바로 지웁니다.
+    사용자별 키 목록은 로컬 항목이 퇴출·만료되면 함께 정리되므로 캐시 예산을 넘어 늘어나지 않습니다.
+    """
+
+    def __init__(self, local: LRUCache, backend: Optional[CacheBackend] = None, ttl: int = 60):
+        self.local = local
+        self.local.on_remove = self._forget_key
+        self.backend = backend
+        self.ttl = ttl
+        self._user_keys: Dict[int, Set[Tuple]] = {}
+        self.backend_hits = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: int, section: str) -> Any:
+        generation = await self._generation(user_id)
+        key = (user_id, generation, section)
+        value = self.local.get(key)
+        if value is not MISSING or self.backend is None:
+            return value
+
+        raw = await self.backend.get(self._backend_key(key))
+        if raw is None:
+            return MISSING
+        value = json.loads(raw)
+        self.backend_hits += 1
+        self._store_local(key, value)
+        return value
+
+    async def set(self, user_id: int, section: str, value: Any) -> None:
+        generation = await self._generation(user_id)
+        key = (user_id, generation, section)
+        self._store_local(key, value)
+        if self.backend is not None:
+            await self.backend.set(
+                self._backend_key(key), json.dumps(value, default=str, ensure_ascii=False), self.ttl
+            )
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """사용자의 모든 통계 캐시를 무효화합니다. 퀘스트 생성·완료·삭제 후 호출합니다."""
+        self.invalidations += 1
+        if self.backend is not None:
+            await self.backend.incr(f"stats:gen:{user_id}")
+        for key in self._user_keys.pop(user_id, ()):
+            self.local.delete(key)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.local.metrics(),
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "backend_hits": self.backend_hits,
+            "invalidations": self.invalidations,
+        }
+
+    async def _generation(self, user_id: int) -> int:
+        if self.backend is None:
+            return 0
+        raw = await self.backend.get(f"stats:gen:{user_id}")
+        return int(raw or 0)
+
+    def _store_local(self, key: Tuple, value: Any) -> None:
+        self.local.set(key, value)
+        # 예산보다 커서 저장되지 않은 값은 기록하지 않음
+        if key in self.local:
+            self._user_keys.setdefault(key[0], set()).add(key)
+
+    def _forget_key(self, key: Tuple) -> None:
+        keys = self._user_keys.get(key[0])
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._user_keys[key[0]]
+
+    @staticmethod
+    def _backend_key(key: Tuple) -> str:
+        user_id, generation, section = key
+        return f"stats:{user_id}:{generation}:{section}"
+
+
+def _create_backend(name: Optional[str]) -> Optional[CacheBackend]:
+    if not name:
+        return None
+    if name == "local":
+        return LocalCacheBackend()
+    raise ValueError(f"Unknown STATS_CACHE_BACKEND: {name}")
+
+
+def _create_stats_cache() -> StatsCache:
+    settings = get_settings()
+    return StatsCache(
+        LRUCache(
+            max_entries=settings.STATS_CACHE_MAX_ENTRIES,
+            max_bytes=settings.STATS_CACHE_MAX_BYTES,
+            ttl=settings.STATS_CACHE_TTL_SECONDS,
+        ),
+        backend=_create_backend(settings.STATS_CACHE_BACKEND),
+        ttl=settings.STATS_CACHE_TTL_SECONDS,
+    )
+
+
+stats_cache = _create_stats_cache()
@@ -0,0 +1,181 @@
+# app/core/user_import.py
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydantic.networks import validate_email
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from . import leaderboard
+from .passwords import password_hasher
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 다중 행 INSERT / IN 조회에 넣는 사용자 수
+IMPORT_BATCH_SIZE = 1000
+
+# 신규 영웅 기본값 (회원가입과 동일)
+HERO_DEFAULTS = {"hero_level": 1, "coin": 0, "avatar_id": 0, "background_id": 0}
+
+
+def _chunks(items: List, size: int = IMPORT_BATCH_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _validate_account(account: Dict) -> Optional[str]:
+    """회원가입 요청(UserCreate)과 같은 기준으로 검사하고, 올바르면 정규화한 이메일을 반환합니다."""
+    if not account.get("password") or not account.get("name"):
+        return None
+    try:
+        _, email = validate_email((account.get("email") or "").strip())
+    except ValueError:
+        return None
+    return email
+
+
+async def import_users(db: AsyncSession, accounts: List[Dict]) -> Dict:
+    """계정 목록(email, password, name, phone_number)으로 사용자와 영웅을 한 트랜잭션에 만듭니다.
+
+    형식이 잘못된 계정(이메일·이름·비밀번호), 이미 가입된 이메일과 목록 안에서 중복된 이메일은 건너뛰고,
+    비밀번호는 대량 가입용 해싱 풀에서 처리합니다.
+    users 는 다중 행 INSERT 로, heroes 는 방금 넣은 users 를 읽는 INSERT ... SELECT 로 만듭니다.
+    """
+    skipped = []
+    unique: Dict[str, Dict] = {}
+    for account in accounts:
+        email = _validate_account(account)
+        if email is None:
+            skipped.append({"email": (account.get("email") or "").strip(), "reason": "invalid"})
+            continue
+        # MySQL 기본 콜레이션처럼 대소문자를 구분하지 않고 중복을 판단
+        if email.lower() in unique:
+            skipped.append({"email": email, "reason": "duplicate"})
+            continue
+        unique[email.lower()] = {**account, "email": email}
+
+    existing = set()
+    for emails in _chunks([account["email"] for account in unique.values()]):
+        result = await db.execute(select(models.User.email).filter(models.User.email.in_(emails)))
+        existing.update(email.lower() for email in result.scalars().all())
+    for email in existing:
+        account = unique.pop(email, None)
+        if account is not None:
+            skipped.append({"email": account["email"], "reason": "exists"})
+
+    if not unique:
+        return {"created": 0, "skipped": skipped}
+
+    now = datetime.utcnow()
+    new_accounts = list(unique.values())
+    hashes = await password_hasher.hash_many([account["password"] for account in new_accounts])
+    rows = [
+        {
+            "email": account["email"],
+            "password": hashed,
+            "name": account["name"],
+            "phone_number": account.get("phone_number"),
+            "join_date": now,
+            "update_date": now,
+        }
+        for account, hashed in zip(new_accounts, hashes)
+    ]
+
+    users = models.User.__table__
+    heroes = models.Hero.__table__
+    created = []
+    for chunk in _chunks(rows):
+        # executemany → 드라이버가 INSERT ... VALUES (...), (...) 한 문장으로 묶어 전송
+        await db.execute(insert(users), chunk)
+        emails = [row["email"] for row in chunk]
+        await db.execute(
+            insert(heroes).from_select(
+                ["user_id", *HERO_DEFAULTS],
+                select(users.c.id, *(literal(value) for value in HERO_DEFAULTS.values()))
+                .where(users.c.email.in_(emails)),
+            )
+        )
+        result = await db.execute(
+            select(users.c.id, users.c.name, users.c.profile_img).where(users.c.email.in_(emails))
+        )
+        created.extend(result.all())
+    await db.commit()
+
+    for row in created:
+        leaderboard.update_level(row.id, HERO_DEFAULTS["hero_level"], name=row.name, profile_img=row.profile_img)
+    return {"created": len(created), "skipped": skipped}
+
+
+class UserImportJobs:
+    """계정 일괄 등록을 요청 밖의 백그라운드 작업으로 실행하고 최근 keep 개의 결과를 보관합니다.
+
+    수천 개의 bcrypt 해싱은 몇 분이 걸릴 수 있으므로 API 는 작업을 등록하고 바로 응답하며,
+    결과는 작업 id 로 조회합니다. 작업 상태는 프로세스 메모리에만 있으므로 작업을 시작한 워커에서만
+    조회할 수 있고, 재시작하면 사라집니다. (실행 중이던 작업은 취소되며 트랜잭션은 롤백됨)
+    """
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, accounts: List[Dict]) -> dict:
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "pending",
+            "total": len(accounts),
+            "created": None,
+            "skipped": None,
+            "error": None,
+            "submitted_at": datetime.utcnow(),
+            "finished_at": None,
+        }
+        self._jobs[job["id"]] = job
+        while len(self._jobs) > self.keep:
+            oldest = next(iter(self._jobs.values()))
+            if oldest["status"] in ("pending", "running"):
+                break
+            self._jobs.popitem(last=False)
+        task = asyncio.create_task(self._run(job, accounts))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._jobs.get(job_id)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, job: dict, accounts: List[Dict]) -> None:
+        job["status"] = "running"
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await import_users(db, accounts)
+            job.update(status="done", created=result["created"], skipped=result["skipped"])
+        except IntegrityError:
+            # 처리 중 같은 이메일이 따로 가입된 경우 — 전체가 롤백되므로 다시 등록하면 됨
+            job.update(status="failed", error="Some emails were registered concurrently, please retry")
+        except asyncio.CancelledError:
+            job.update(status="failed", error="Cancelled")
+            raise
+        except Exception:
+            logger.exception("user import job %s failed", job["id"])
+            job.update(status="failed", error="Import failed")
+        finally:
+            job["finished_at"] = datetime.utcnow()
+
+
+user_import_jobs = UserImportJobs(keep=get_settings().USER_IMPORT_KEEP_JOBS)
@@ -1,11 +1,25 @@
 # app/core/utils.py
 
-from passlib.context import CryptContext
+import json
+from typing import List
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .passwords import password_hasher
 
-def hash_password(plain_password: str) -> str:
-    return pwd_context.hash(plain_password)
+# 비밀번호 해싱·검증은 이벤트 루프를 막지 않도록 전용 스레드 풀에서 실행
+async def hash_password(plain_password: str) -> str:
+    return await password_hasher.hash(plain_password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+def parse_tags(raw) -> List[str]:
+    """quests.tag 에 JSON 문자열(또는 리스트)로 저장된 태그를 리스트로 변환합니다."""
+    if not raw:
+        return []
+    try:
+        tags = json.loads(raw) if isinstance(raw, str) else raw
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(tags, list):
+        return []
+    return [tag for tag in tags if isinstance(tag, str)]
@@ -1,11 +1,23 @@
 # app/main.py
 
-from fastapi import FastAPI
-from app.database import engine, Base
-from app.routers import users, hero, item, quest, social, settings, statistics, friends  # statistics 추가
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from app.database import engine, Base, AsyncSessionLocal
+from app.routers import users, hero, item, quest, social, settings, statistics, friends, metrics  # statistics 추가
+from app.core import hero_stats, leaderboard, quest_events  # noqa: F401  (quest_completed 핸들러 등록)
+from app.core.deadline_sweeper import deadline_sweeper
+from app.core.user_import import user_import_jobs
+from app.core.events import event_bus
+from app.core.quest_generator import quest_pool
+from app.core.item_catalog import item_catalog
+from app.core.passwords import PasswordHasherBusy
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+app = FastAPI(
+    title="My MiniHome Backend",
+    description="Flutter 연동용 백엔드 API",
+    version="1.0.0"
+)
 
 # 비동기 데이터베이스 초기화
 async def init_db():
@@ -13,15 +25,42 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 # 애플리케이션 시작 시 DB 초기화
+# (app 을 다시 생성하면 핸들러가 사라지므로 최종 app 에 등록)
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    # 태그별 능력치 증가량 테이블은 시작 시 한 번만 로드
+    hero_stats.load_tag_stat_deltas()
+    # 내 순위 조회용 전체 순위 구조를 heroes 로부터 구축
+    async with AsyncSessionLocal() as db:
+        await leaderboard.rank_index.rebuild(db)
+        # 상점 아이템 카탈로그 적재
+        await item_catalog.load(db)
+    # 다른 워커의 레벨 변경도 반영되도록 순위 구조를 백그라운드에서 주기적으로 재구축
+    leaderboard.rank_index.start()
+    # 커밋 이후 이벤트(아웃박스) 처리 워커 시작 — 재시작 전 남은 이벤트도 이어서 처리
+    event_bus.start()
+    # 마감 지난 미완료 퀘스트를 주기적으로 expired 로 표시
+    deadline_sweeper.start()
+    # AI 퀘스트 풀을 백그라운드에서 채움 (시작을 기다리게 하지 않음)
+    quest_pool.start()
 
-app = FastAPI(
-    title="My MiniHome Backend",
-    description="Flutter 연동용 백엔드 API",
-    version="1.0.0"
-)
+@app.on_event("shutdown")
+async def shutdown_event():
+    await user_import_jobs.stop()
+    await quest_pool.stop()
+    await deadline_sweeper.stop()
+    await event_bus.stop()
+    await leaderboard.rank_index.stop()
+
+# 비밀번호 해싱 대기열이 가득 차면 기다리게 하지 않고 바로 503 으로 응답
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many password requests, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 # CORS (Flutter 등에서 접근 시 필요할 수 있음)
 app.add_middleware(
@@ -41,6 +80,7 @@ app.include_router(social.router)
 app.include_router(settings.router)
 app.include_router(statistics.router)  # statistics 라우터 등록
 app.include_router(friends.router)
+app.include_router(metrics.router)
 
 # 헬스 체크 용도
 @app.get("/")
@@ -1,6 +1,6 @@
 # app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import relationship
 from .database import Base
 from datetime import datetime, timedelta
@@ -29,6 +29,12 @@ class Hero(Base):
     coin = Column(Integer, default=0)
     avatar_id = Column(Integer)
     background_id = Column(Integer)
+    # 퀘스트 완료 시 태그별로 누적되는 능력치 (응답의 vitality = stamina, dexterity = skill)
+    strength = Column(Integer, nullable=False, default=0, server_default="0")
+    intelligence = Column(Integer, nullable=False, default=0, server_default="0")
+    stamina = Column(Integer, nullable=False, default=0, server_default="0")
+    skill = Column(Integer, nullable=False, default=0, server_default="0")
+    endurance = Column(Integer, nullable=False, default=0, server_default="0")
     # 태그나 did_info를 문자열(JSON)로 저장하거나, PostgreSQL이라면 배열 타입을 쓸 수도 있음.
 
 class Story(Base):
@@ -55,6 +61,11 @@ class Receipt(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     item_id = Column(Integer, ForeignKey("items.id"))
 
+    # 사용자당 아이템 한 번만 구매 (보유 여부 조회도 이 인덱스만으로 처리)
+    __table_args__ = (
+        Index("uq_receipts_user_item", "user_id", "item_id", unique=True),
+    )
+
 class Quest(Base):
     __tablename__ = "quests"
 
@@ -72,6 +83,61 @@ class Quest(Base):
     progress_time = Column(Integer)  # 필요하다면
     complete_time = Column(Integer)  # 필요하다면
     deadline = Column(DateTime, default=lambda: datetime.utcnow() + timedelta(hours=24))
+    expired = Column(Boolean, nullable=False, default=False, server_default="0")  # 마감 지난 미완료 (스위퍼가 표시)
+
+    # 통계·이력 조회용 복합 인덱스 (날짜 조건은 [start, end) 범위로만 사용해야 인덱스를 탐)
+    __table_args__ = (
+        Index("idx_user_quests", "user_id", "quest_type", "finish"),
+        Index("idx_quests_user_finish_time", "user_id", "finish", "finish_time"),
+        Index("idx_quests_user_start_time", "user_id", "start_time", "progress_time"),
+        # 목록 조회용: 목록은 항상 expired 로 거르므로 (user_id, expired[, finish]) 동등 조건 뒤 id 순으로
+        # 읽어 ORDER BY id DESC LIMIT n 을 파일 정렬 없이 처리
+        Index("idx_quests_user_expired", "user_id", "expired", "id"),
+        Index("idx_quests_user_expired_finish", "user_id", "expired", "finish", "id"),
+        Index("idx_quests_user_deadline", "user_id", "deadline"),
+        # 마감 스위퍼용: 미완료·미만료 퀘스트를 마감 순으로 읽음
+        Index("idx_quests_expiry", "finish", "expired", "deadline"),
+    )
+
+class QuestTag(Base):
+    __tablename__ = "quest_tags"
+
+    # quests.tag(JSON 문자열)를 정규화한 태그 인덱스 (퀘스트 생성·삭제 시 함께 갱신)
+    quest_id = Column(Integer, ForeignKey("quests.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(50), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    __table_args__ = (
+        Index("idx_quest_tags_user_tag", "user_id", "tag"),
+    )
+
+class UserDailyActivity(Base):
+    __tablename__ = "user_daily_activity"
+
+    # 사용자/날짜별 퀘스트 완료 집계 (퀘스트 완료·삭제 시 같은 트랜잭션에서 갱신)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    activity_date = Column(Date, primary_key=True)
+    completed_count = Column(Integer, nullable=False, default=0)
+    progress_seconds = Column(Integer, nullable=False, default=0)
+    earned_xp = Column(Integer, nullable=False, default=0)
+    tag_counts = Column(JSON)  # {"공부": 2, "취미": 1}
+
+class OutboxEvent(Base):
+    __tablename__ = "event_outbox"
+
+    # 커밋 이후 처리할 이벤트 (발생시킨 변경과 같은 트랜잭션에서 기록, 처리되면 삭제)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # 재시도 가능 시각
+    dead = Column(Boolean, nullable=False, default=False)  # 최대 재시도 초과
+    last_error = Column(String(255))
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_event_outbox_pending", "dead", "available_at"),
+    )
 
 class Friend(Base):
     __tablename__ = "friends"
@@ -103,4 +169,15 @@ class Admin(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+class Notification(Base):
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    contents = Column(String)
+    type = Column(String(50))
+    related_id = Column(Integer)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime, server_default=func.now())
@@ -1,26 +1,51 @@
 # app/routers/hero.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from app.config import get_settings
+from app.database import get_db
 from app import models, schemas
+from app.core import coins, leaderboard
+from app.core.stats_cache import stats_cache
+from app.utils import auth
 
 router = APIRouter(
     prefix="/hero",
     tags=["Hero"]
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def _get_hero(db: AsyncSession, user_id: int):
+    result = await db.execute(select(models.Hero).filter(models.Hero.user_id == user_id))
+    return result.scalar_one_or_none()
+
+# 퀘스트 완료 보상을 서버가 지급하도록 바뀐 뒤(QUEST_SERVER_REWARDS)에는 클라이언트의 보상 호출을 막아
+# 같은 클리어에 두 번 지급되지 않게 함
+def _reject_if_server_rewards():
+    if get_settings().QUEST_SERVER_REWARDS:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Quest rewards are granted by the server when a quest is cleared"
+        )
+
+# 레벨이 바뀐 뒤(커밋 이후) 랭킹 구조와 통계 캐시에 반영
+# (순위 구조가 모르는 사용자 — 새 영웅 등 — 는 이름이 있어야 들어가므로 이름·프로필을 함께 넘김)
+async def _on_level_changed(db: AsyncSession, user_id: int, level: int):
+    name = profile_img = None
+    if leaderboard.rank_index.get(user_id) is None:
+        result = await db.execute(
+            select(models.User.name, models.User.profile_img).filter(models.User.id == user_id)
+        )
+        row = result.first()
+        if row is not None:
+            name, profile_img = row.name, row.profile_img
+    leaderboard.update_level(user_id, level, name=name, profile_img=profile_img)
+    await stats_cache.invalidate_user(user_id)
 
 @router.post("/make/{user_id}")
-def create_hero(user_id: int, db: Session = Depends(get_db)):
+async def create_hero(user_id: int, db: AsyncSession = Depends(get_db)):
     # 이미 해당 user_id에 hero가 있는지 확인 (1:1 관계)
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
+    hero = await _get_hero(db, user_id)
     if hero:
         raise HTTPException(status_code=400, detail="Hero already exists for this user")
 
@@ -32,13 +57,13 @@ def create_hero(user_id: int, db: Session = Depends(get_db)):
         background_id=0
     )
     db.add(new_hero)
-    db.commit()
-    db.refresh(new_hero)
+    await db.commit()
+    await _on_level_changed(db, user_id, new_hero.hero_level)
     return {"message": f"Hero created for user {user_id}"}
 
 @router.put("/edit/{user_id}")
-def edit_hero(user_id: int, hero_data: schemas.HeroBase, db: Session = Depends(get_db)):
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
+async def edit_hero(user_id: int, hero_data: schemas.HeroBase, db: AsyncSession = Depends(get_db)):
+    hero = await _get_hero(db, user_id)
     if not hero:
         raise HTTPException(status_code=404, detail="Hero not found for this user")
 
@@ -46,29 +71,58 @@ def edit_hero(user_id: int, hero_data: schemas.HeroBase, db: Session = Depends(g
     hero.coin = hero_data.coin
     hero.avatar_id = hero_data.avatar_id
     hero.background_id = hero_data.background_id
-    db.commit()
-    db.refresh(hero)
+    await db.commit()
+    await _on_level_changed(db, user_id, hero.hero_level)
     return {"message": "Hero updated", "hero": hero_data}
 
-@router.post("/level-up/{user_id}")
-def level_up_hero(user_id: int, db: Session = Depends(get_db)):
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
-    if not hero:
+@router.post("/level-up/{user_id}", deprecated=True)
+async def level_up_hero(user_id: int, db: AsyncSession = Depends(get_db)):
+    _reject_if_server_rewards()
+    # 읽고 더해서 쓰지 않고 한 번의 UPDATE 로 올림 (동시 요청에도 유실 없음)
+    result = await db.execute(
+        update(models.Hero)
+        .filter(models.Hero.user_id == user_id)
+        .values(hero_level=models.Hero.hero_level + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
         raise HTTPException(status_code=404, detail="Hero not found")
 
-    hero.hero_level += 1
-    db.commit()
-    db.refresh(hero)
-    return {"message": f"Hero level up! Current level: {hero.hero_level}"}
+    result = await db.execute(select(models.Hero.hero_level).filter(models.Hero.user_id == user_id))
+    level = result.scalar_one()
+    await db.commit()
+    await _on_level_changed(db, user_id, level)
+    return {"message": f"Hero level up! Current level: {level}"}
 
-@router.post("/reward/{user_id}")
-def reward_hero(user_id: int, reward_coin: int = 10, db: Session = Depends(get_db)):
-    # 예시: 퀘스트 완료 보상
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
-    if not hero:
+# 이벤트 보상 일괄 지급 (관리자 전용, 한 UPDATE 문으로 여러 영웅에게 지급)
+# /reward/{user_id} 보다 먼저 등록해야 "batch" 가 user_id 로 해석되지 않음
+@router.post("/reward/batch")
+async def reward_heroes(
+    payload: schemas.HeroRewardBatch,
+    admin_id: int = Depends(auth.get_current_admin_id),
+    db: AsyncSession = Depends(get_db)
+):
+    if not payload.rewards:
+        raise HTTPException(status_code=400, detail="No rewards given")
+    max_rewards = get_settings().HERO_REWARD_BATCH_MAX
+    if len(payload.rewards) > max_rewards:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_rewards} rewards per batch"
+        )
+    credited = await coins.add_many(db, [(reward.user_id, reward.coin) for reward in payload.rewards])
+    await db.commit()
+    missing = sorted({reward.user_id for reward in payload.rewards} - set(credited))
+    return {"message": f"Reward given to {len(credited)} heroes", "credited": len(credited), "missing": missing}
+
+@router.post("/reward/{user_id}", deprecated=True)
+async def reward_hero(user_id: int, reward_coin: int = 10, db: AsyncSession = Depends(get_db)):
+    _reject_if_server_rewards()
+    # 예시: 퀘스트 완료 보상 (읽고 더해서 쓰지 않고 한 번의 UPDATE 로 지급)
+    if not await coins.add(db, user_id, reward_coin):
         raise HTTPException(status_code=404, detail="Hero not found")
 
-    hero.coin += reward_coin
-    db.commit()
-    db.refresh(hero)
-    return {"message": f"Reward given. Current coin: {hero.coin}"}
\ No newline at end of file
+    result = await db.execute(select(models.Hero.coin).filter(models.Hero.user_id == user_id))
+    coin = result.scalar_one()
+    await db.commit()
+    return {"message": f"Reward given. Current coin: {coin}"}
@@ -1,63 +1,107 @@
 # app/routers/item.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.database import get_db
 from app import models
+from app.core import coins
+from app.core.inventory import inventory
+from app.core.item_catalog import item_catalog
+from app.utils import auth
 
 router = APIRouter(
     prefix="/item",
     tags=["Item"]
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.post("/avatar-buy/{user_id}/{item_id}")
-def buy_avatar(user_id: int, item_id: int, db: Session = Depends(get_db)):
-    # 아이템 존재 확인
-    item = db.query(models.Item).filter(models.Item.id == item_id).first()
+async def _get_avatar_item(db: AsyncSession, item_id: int) -> dict:
+    await item_catalog.ensure_fresh(db)
+    item = item_catalog.get(item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if item.item_type != "avatar":
+    if item["item_type"] != "avatar":
         raise HTTPException(status_code=400, detail="Not an avatar item")
+    return item
 
-    # 코인 차감 로직, 영수증 기록 등
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
-    if not hero:
-        raise HTTPException(status_code=404, detail="Hero not found")
+# 아이템 카탈로그 (상점 화면용)
+# - 메모리 카탈로그에서 응답하며, If-None-Match 가 현재 ETag 와 같으면 304
+@router.get("/catalog")
+async def get_item_catalog(
+    response: Response,
+    item_type: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    await item_catalog.ensure_fresh(db)
+    headers = {"ETag": item_catalog.etag, "Cache-Control": "no-cache"}
+    if if_none_match == item_catalog.etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return {"version": item_catalog.version, "items": item_catalog.items(item_type)}
 
-    if hero.coin < item.price:
-        raise HTTPException(status_code=400, detail="Insufficient coin")
+# 아이템 추가·수정 배포 후 카탈로그를 즉시 다시 읽기 (관리자 전용, 내용이 바뀌었으면 version 증가)
+@router.post("/catalog/refresh")
+async def refresh_item_catalog(
+    admin_id: int = Depends(auth.get_current_admin_id),
+    db: AsyncSession = Depends(get_db)
+):
+    changed = await item_catalog.refresh(db)
+    return {"changed": changed, "version": item_catalog.version, "etag": item_catalog.etag}
+
+# 보유 아이템 조회 (상점의 "보유" 표시용 item_ids 포함)
+@router.get("/inventory/{user_id}")
+async def get_inventory(user_id: int, db: AsyncSession = Depends(get_db)):
+    await item_catalog.ensure_fresh(db)
+    item_ids = await inventory.owned_ids(db, user_id)
+    return {
+        "item_ids": item_ids,
+        "items": [item_catalog.get(item_id) for item_id in item_ids if item_catalog.get(item_id)],
+    }
+
+@router.post("/avatar-buy/{user_id}/{item_id}")
+async def buy_avatar(user_id: int, item_id: int, db: AsyncSession = Depends(get_db)):
+    # 아이템 존재 확인 (메모리 카탈로그)
+    item = await _get_avatar_item(db, item_id)
+    if (await inventory.owned_bits(db, user_id) >> item_id) & 1:
+        raise HTTPException(status_code=400, detail="Item already owned")
 
-    hero.coin -= item.price
-    db.commit()
+    # 코인 차감 (잔액 조건부 UPDATE 한 번) + 영수증 기록을 한 트랜잭션에서 처리
+    if not await coins.spend(db, user_id, item["price"]):
+        await db.rollback()
+        result = await db.execute(select(models.Hero.id).filter(models.Hero.user_id == user_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Hero not found")
+        raise HTTPException(status_code=400, detail="Insufficient coin")
 
-    # Receipt에 기록
-    receipt = models.Receipt(user_id=user_id, item_id=item_id)
-    db.add(receipt)
-    db.commit()
+    db.add(models.Receipt(user_id=user_id, item_id=item_id))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # (user_id, item_id) 유니크 인덱스 — 동시에 같은 아이템을 산 경우 코인 차감도 함께 롤백
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Item already owned")
+    inventory.add(user_id, item_id)
     return {"message": "Avatar item purchased successfully."}
 
 @router.post("/avatar-wear/{user_id}/{item_id}")
-def wear_avatar(user_id: int, item_id: int, db: Session = Depends(get_db)):
-    # hero.avatar_id = item_id 로 세팅
-    hero = db.query(models.Hero).filter(models.Hero.user_id == user_id).first()
-    if not hero:
-        raise HTTPException(status_code=404, detail="Hero not found")
-
-    item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    if item.item_type != "avatar":
-        raise HTTPException(status_code=400, detail="Not an avatar item")
+async def wear_avatar(user_id: int, item_id: int, db: AsyncSession = Depends(get_db)):
+    item = await _get_avatar_item(db, item_id)
+    if not await inventory.owns(db, user_id, item_id):
+        raise HTTPException(status_code=403, detail="Item not owned")
 
-    hero.avatar_id = item_id
-    db.commit()
+    # hero.avatar_id = item_id 로 세팅 (영웅 조회 없이 UPDATE 한 번)
+    result = await db.execute(
+        update(models.Hero)
+        .filter(models.Hero.user_id == user_id)
+        .values(avatar_id=item["id"])
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise HTTPException(status_code=404, detail="Hero not found")
+    await db.commit()
     return {"message": f"Avatar changed to item {item_id}"}
 
 # 배경 구매/착용, 아이템 삭제, 코인 업데이트 등 유사 로직으로 구현
\ No newline at end of file
@@ -0,0 +1,65 @@
+# app/routers/metrics.py
+
+from fastapi import APIRouter, Depends
+from app.core.deadline_sweeper import deadline_sweeper
+from app.core.events import event_bus
+from app.core.inventory import inventory
+from app.core.item_catalog import item_catalog
+from app.core.leaderboard import leaderboard, rank_index
+from app.core.passwords import password_hasher
+from app.core.principal_cache import principal_cache
+from app.core.quest_generator import quest_pool
+from app.core.stats_cache import stats_cache
+from app.utils import auth
+
+# 내부 상태를 노출하므로 모든 엔드포인트는 관리자 전용
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(auth.get_current_admin_id)]
+)
+
+# ✅ 통계 캐시 적중/실패/퇴출 카운터 (캐시 크기 산정용)
+@router.get("/stats-cache")
+async def get_stats_cache_metrics():
+    return stats_cache.metrics()
+
+# ✅ 랭킹 캐시 적중/DB 조회/재적재 횟수, 전체 순위 구조 크기
+@router.get("/leaderboard")
+async def get_leaderboard_metrics():
+    return {**leaderboard.metrics(), "rank_index": rank_index.metrics()}
+
+# ✅ 비밀번호 해싱 풀 대기 작업 수/거절 수/평균·최대 소요 시간
+@router.get("/password-hasher")
+async def get_password_hasher_metrics():
+    return password_hasher.metrics()
+
+# ✅ 인증 사용자 캐시 적중률 (요청당 users 조회 생략 비율)
+@router.get("/principal-cache")
+async def get_principal_cache_metrics():
+    return principal_cache.metrics()
+
+# ✅ 아이템 카탈로그 항목 수/버전/재적재 횟수
+@router.get("/item-catalog")
+async def get_item_catalog_metrics():
+    return item_catalog.metrics()
+
+# ✅ 보유 아이템 비트셋 캐시 적중률/DB 재확인 횟수
+@router.get("/inventory")
+async def get_inventory_metrics():
+    return inventory.metrics()
+
+# ✅ 이벤트 아웃박스 발행/처리/실패/dead 건수
+@router.get("/events")
+async def get_event_metrics():
+    return event_bus.metrics()
+
+# ✅ 마감 스위퍼 묶음 크기/처리 건수/소요 시간/밀린 시간
+@router.get("/deadline-sweeper")
+async def get_deadline_sweeper_metrics():
+    return deadline_sweeper.metrics()
+
+# ✅ AI 퀘스트 풀 태그별 잔량/요청 경로 직접 생성 횟수/폐기 수
+@router.get("/ai-quest-pool")
+async def get_ai_quest_pool_metrics():
+    return quest_pool.metrics()
@@ -1,20 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from app.database import get_db
 from app import models
 from sqlalchemy.future import select
 from app.database import SessionLocal
+from app.config import get_settings
+from app.core import quest_ops, quest_tags
+from app.core.quest_generator import GENERAL_POOL, quest_pool
+from app.core.stats_cache import stats_cache
 from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+import json
 
 router = APIRouter(
     prefix="/quest",
     tags=["Quest"]
 )
 
+settings = get_settings()
+
 class QuestCreateRequest(BaseModel):
     title: str
     description: str
+    tag: Optional[List[str]] = None
     
     
 async def get_db():
@@ -37,64 +47,209 @@ async def create_self_quest(user_id: int, request: QuestCreateRequest, db: Async
         user_id=user_id,
         title=request.title,
         description=request.description,
+        tag=json.dumps(quest_tags.normalize_tags(request.tag), ensure_ascii=False) if request.tag else None,
         quest_type="self"
     )
     db.add(new_quest)
+    if new_quest.tag:
+        # 태그 인덱스(quest_tags)도 같은 트랜잭션에서 기록
+        await db.flush()
+        await quest_tags.set_quest_tags(db, new_quest)
     await db.commit()
+    await stats_cache.invalidate_user(user_id)
     await db.refresh(new_quest)
     return {"message": "Self quest created", "quest": new_quest}
 
 # ✅ 자기주도 퀘스트 클리어
 @router.put("/self-clear/{quest_id}")
 async def clear_self_quest(quest_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Quest).filter(models.Quest.id == quest_id))
-    quest = result.scalars().first()
+    quest = (await quest_ops.lock_quests(db, [quest_id])).get(quest_id)
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
-    quest.finish = True
-    quest.finish_time = func.now()
-    await db.commit()
+    if not quest.finish:
+        # 일별 집계와 영웅 능력치도 같은 트랜잭션에서 갱신
+        await quest_ops.complete_quests(db, [quest], datetime.now())
+        await db.commit()
+        await stats_cache.invalidate_user(quest.user_id)
     return {"message": f"Quest {quest_id} completed"}
 
 # ✅ 히어로 퀘스트 생성
+# - 태그별로 미리 생성해 둔 풀에서 꺼내므로 생성 지연 없음 (tag 가 없으면 일반 퀘스트)
 @router.post("/ai-gen/{user_id}")
-async def create_ai_quest(user_id: int, db: AsyncSession = Depends(get_db)):
+async def create_ai_quest(user_id: int, tag: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    pool_tag = tag.strip() if tag else GENERAL_POOL
+    if not quest_pool.supports(pool_tag):
+        raise HTTPException(status_code=400, detail=f"Unsupported tag: {tag}")
+    generated = await quest_pool.claim(pool_tag)
+
     new_quest = models.Quest(
         user_id=user_id,
-        description="AI가 생성한 퀘스트 내용",
+        title=generated["title"],
+        description=generated["description"],
+        tag=json.dumps(generated["tag"], ensure_ascii=False) if generated["tag"] else None,
         quest_type="ai"
     )
     db.add(new_quest)
+    if new_quest.tag:
+        # 태그 인덱스(quest_tags)도 같은 트랜잭션에서 기록
+        await db.flush()
+        await quest_tags.set_quest_tags(db, new_quest)
     await db.commit()
-    await db.refresh(new_quest)
-    return {"message": "AI quest created", "quest_id": new_quest.id}
+    await stats_cache.invalidate_user(user_id)
+    return {"message": "AI quest created", "quest_id": new_quest.id, "title": new_quest.title}
 
 # ✅ 히어로 퀘스트 클리어
 @router.put("/ai-clear/{quest_id}")
 async def clear_ai_quest(quest_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Quest).filter(models.Quest.id == quest_id))
-    quest = result.scalars().first()
+    quest = (await quest_ops.lock_quests(db, [quest_id])).get(quest_id)
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
-    quest.finish = True
-    quest.finish_time = func.now()
-    await db.commit()
+    if not quest.finish:
+        # 일별 집계와 영웅 능력치도 같은 트랜잭션에서 갱신
+        await quest_ops.complete_quests(db, [quest], datetime.now())
+        await db.commit()
+        await stats_cache.invalidate_user(quest.user_id)
     return {"message": f"AI quest {quest_id} completed"}
 
 # ✅ 퀘스트 삭제
 @router.delete("/remove/{quest_id}")
 async def remove_quest(quest_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Quest).filter(models.Quest.id == quest_id))
-    quest = result.scalars().first()
+    quest = (await quest_ops.lock_quests(db, [quest_id])).get(quest_id)
     if not quest:
         raise HTTPException(status_code=404, detail="Quest not found")
-    await db.delete(quest)
+    await quest_ops.remove_quests(db, [quest])
     await db.commit()
+    await stats_cache.invalidate_user(quest.user_id)
     return {"message": f"Quest {quest_id} removed"}
 
-# ✅ 유저의 전체 퀘스트 목록 조회
+class QuestBatchCreateRequest(BaseModel):
+    quests: List[QuestCreateRequest]
+
+class QuestBatchIdsRequest(BaseModel):
+    quest_ids: List[int]
+
+# 같은 id 가 여러 번 오면 한 번만 처리하고 결과도 한 번만 반환 (순서 유지)
+def _unique_ids(quest_ids: List[int]) -> List[int]:
+    return list(dict.fromkeys(quest_ids))
+
+def _check_batch_size(count: int):
+    if count == 0:
+        raise HTTPException(status_code=400, detail="No operations given")
+    if count > settings.QUEST_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.QUEST_BATCH_MAX_OPERATIONS} operations per batch"
+        )
+
+# ✅ 자기주도 퀘스트 일괄 생성 (오프라인 동기화용, 한 트랜잭션·다중 행 INSERT)
+@router.post("/batch/self-gen/{user_id}")
+async def create_self_quests(user_id: int, request: QuestBatchCreateRequest, db: AsyncSession = Depends(get_db)):
+    _check_batch_size(len(request.quests))
+    quests = await quest_ops.create_quests(
+        db, user_id, [{**item.dict(), "quest_type": "self"} for item in request.quests]
+    )
+    await db.commit()
+    await stats_cache.invalidate_user(user_id)
+    return {
+        "message": f"{len(quests)} quests created",
+        "results": [
+            {"index": index, "quest_id": quest.id, "status": "created"}
+            for index, quest in enumerate(quests)
+        ],
+    }
+
+# ✅ 퀘스트 일괄 클리어 (자기주도/히어로 공통, UPDATE ... WHERE id IN)
+@router.put("/batch/clear/{user_id}")
+async def clear_quests(user_id: int, request: QuestBatchIdsRequest, db: AsyncSession = Depends(get_db)):
+    quest_ids = _unique_ids(request.quest_ids)
+    _check_batch_size(len(quest_ids))
+    found = await quest_ops.lock_quests(db, quest_ids, user_id)
+    pending = {quest.id: quest for quest in found.values() if not quest.finish}
+    await quest_ops.complete_quests(db, list(pending.values()), datetime.now())
+    await db.commit()
+    if pending:
+        await stats_cache.invalidate_user(user_id)
+
+    results = []
+    for quest_id in quest_ids:
+        if quest_id not in found:
+            status = "not_found"
+        elif quest_id in pending:
+            status = "completed"
+        else:
+            status = "already_finished"
+        results.append({"quest_id": quest_id, "status": status})
+    return {"results": results}
+
+# ✅ 퀘스트 일괄 삭제 (DELETE ... WHERE id IN)
+@router.post("/batch/remove/{user_id}")
+async def remove_quests(user_id: int, request: QuestBatchIdsRequest, db: AsyncSession = Depends(get_db)):
+    quest_ids = _unique_ids(request.quest_ids)
+    _check_batch_size(len(quest_ids))
+    found = await quest_ops.lock_quests(db, quest_ids, user_id)
+    await quest_ops.remove_quests(db, list(found.values()))
+    await db.commit()
+    if found:
+        await stats_cache.invalidate_user(user_id)
+
+    results = []
+    for quest_id in quest_ids:
+        status = "removed" if quest_id in found else "not_found"
+        results.append({"quest_id": quest_id, "status": status})
+    return {"results": results}
+
+# 목록 화면에 필요한 컬럼만 조회
+QUEST_LIST_COLUMNS = (
+    "id", "title", "description", "tag", "quest_type", "finish",
+    "start_time", "finish_time", "deadline", "progress_time", "expired",
+)
+
+# ✅ 유저의 퀘스트 목록 조회
+# - 최신순(id 내림차순) keyset 페이지네이션: 다음 페이지는 X-Next-After-Id 헤더 값을 after_id 로 전달
+# - 필터: finish, expired(기본 false 로 마감 지난 미완료 퀘스트는 빼고, true 면 그것만), quest_type, 마감 구간 [deadline_from, deadline_to), tag
 @router.get("/list/{user_id}")
-async def get_user_quests(user_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.Quest).filter(models.Quest.user_id == user_id))
-    quests = result.scalars().all()
-    return quests
\ No newline at end of file
+async def get_user_quests(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    after_id: Optional[int] = Query(None, ge=1),
+    finish: Optional[bool] = None,
+    expired: bool = False,
+    quest_type: Optional[str] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    tag: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    query = (
+        select(*(getattr(models.Quest, name) for name in QUEST_LIST_COLUMNS))
+        .filter(models.Quest.user_id == user_id)
+        .order_by(models.Quest.id.desc())
+        .limit(limit)
+    )
+    if tag is not None:
+        tags = quest_tags.normalize_tags([tag])
+        if not tags:
+            return []
+        # quest_tags 의 (user_id, tag) 인덱스로 대상 퀘스트를 좁힘
+        query = query.join(models.QuestTag, models.QuestTag.quest_id == models.Quest.id).filter(
+            models.QuestTag.user_id == user_id,
+            models.QuestTag.tag == tags[0]
+        )
+    if after_id is not None:
+        query = query.filter(models.Quest.id < after_id)
+    if finish is not None:
+        query = query.filter(models.Quest.finish == finish)
+    query = query.filter(models.Quest.expired == expired)
+    if quest_type is not None:
+        query = query.filter(models.Quest.quest_type == quest_type)
+    if deadline_from is not None:
+        query = query.filter(models.Quest.deadline >= deadline_from)
+    if deadline_to is not None:
+        query = query.filter(models.Quest.deadline < deadline_to)
+
+    result = await db.execute(query)
+    quests = [dict(row._mapping) for row in result.all()]
+    if len(quests) == limit:
+        response.headers["X-Next-After-Id"] = str(quests[-1]["id"])
+    return quests
@@ -1,416 +1,238 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 from .. import models, schemas
 from ..database import get_db
-from ..utils.auth import get_current_user
-import json
+from ..config import get_settings
+from ..utils.auth import get_current_user_id
+from ..core import hero_stats, quest_tags, statistics_engine as engine
+from ..core.cache import MISSING
+from ..core.stats_cache import stats_cache
 
 router = APIRouter(
     prefix="/hero/statistics",
     tags=["Statistics"]
 )
 
+settings = get_settings()
+
+PERIOD_TYPES = ("week", "month", "year")
+
 @router.get("/{user_id}")
 async def get_user_statistics(
     user_id: int, 
-    current_user: models.User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """사용자의 종합 통계 데이터를 가져옵니다."""
     # 현재 인증된 사용자가 요청된 사용자 ID와 일치하는지 확인
-    if current_user.id != user_id:
+    if current_user_id != user_id:
         raise HTTPException(
             status_code=403,
             detail="다른 사용자의 통계 정보에 접근할 권한이 없습니다."
         )
     
-    # 현재 유저의 Hero 정보 가져오기
-    hero_result = await db.execute(
-        select(models.Hero).filter(models.Hero.user_id == user_id)
+    # 퀘스트가 바뀌기 전까지는 같은 응답이므로 캐시 우선 (날짜가 바뀌면 새 키)
+    section = f"dashboard:{date.today()}"
+    cached = await stats_cache.get(user_id, section)
+    if cached is not MISSING:
+        return cached
+    
+    now = datetime.now()
+    
+    # 섹션들은 서로 독립적이므로 설정에 따라 각자 세션으로 동시에 실행
+    results = await engine.run_sections(
+        db,
+        {
+            # 현재 유저의 Hero 정보
+            "hero": lambda session: _get_hero(session, user_id),
+            # 요약 수치(총/완료 퀘스트, 최근 7일 평균, 월간 완료 수)는 집계 쿼리 한 번으로 계산
+            "aggregate": lambda session: engine.fetch_quest_summary(session, user_id, now),
+            # 연속 달성 일수
+            "streak": lambda session: _calculate_streak_days(session, user_id),
+            # 캘린더 데이터
+            "calendar": lambda session: _get_calendar_data(session, user_id),
+            # 태그 통계 데이터
+            "tags": lambda session: _get_tag_statistics(session, user_id),
+            # 주간 활동 데이터
+            "weekly": lambda session: _get_weekly_activity(session, user_id),
+        },
+        concurrent=settings.STATS_CONCURRENT_SECTIONS,
+        max_concurrency=settings.STATS_MAX_CONCURRENT_SECTIONS,
     )
-    hero = hero_result.scalar_one_or_none()
     
+    hero = results["hero"]
     if not hero:
         raise HTTPException(
             status_code=404,
             detail="영웅 정보를 찾을 수 없습니다."
         )
-    
-    # 총 퀘스트 수와 완료한 퀘스트 수 계산
-    total_quests_result = await db.execute(
-        select(func.count()).select_from(models.Quest).filter(
-            models.Quest.user_id == user_id
-        )
-    )
-    total_quests = total_quests_result.scalar_one() or 0
-    
-    completed_quests_result = await db.execute(
-        select(func.count()).select_from(models.Quest).filter(
-            models.Quest.user_id == user_id,
-            models.Quest.finish == True
+    streak_days, longest_streak_days = results["streak"]
+    
+    statistics = {
+        "summary": engine.build_summary(
+            results["aggregate"], hero.hero_level, streak_days, longest_streak_days
+        ),
+        "calendar": results["calendar"],
+        "tags": results["tags"],
+        "weekly": results["weekly"],
+        # 스탯 정보 (퀘스트 완료 시 heroes 에 누적된 값)
+        "stats": hero_stats.build_stats(hero)
+    }
+    await stats_cache.set(user_id, section, statistics)
+    return statistics
+
+@router.get("/{user_id}/period")
+async def get_period_statistics(
+    user_id: int, 
+    type: Optional[str] = None,
+    granularity: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """특정 기간의 활동 통계를 가져옵니다.
+
+    - type: 'week'(최근 7일, 일별), 'month'(최근 4주, 주별), 'year'(올해, 월별)
+    - type 없이 granularity('day', 'week', 'month')와 start, end(미포함)로 임의 구간 조회
+    """
+    if current_user_id != user_id:
+        raise HTTPException(
+            status_code=403,
+            detail="다른 사용자의 통계 정보에 접근할 권한이 없습니다."
         )
-    )
-    completed_quests = completed_quests_result.scalar_one() or 0
     
-    # 경험치는 현재 레벨 기준으로 계산 (예시)
-    total_xp = hero.hero_level * 1000
+    section = f"period:{date.today()}:{type}:{granularity}:{start}:{end}"
+    cached = await stats_cache.get(user_id, section)
+    if cached is not MISSING:
+        return cached
     
-    # 평균 일일 활동 시간 계산 (최근 7일)
-    now = datetime.now()
-    seven_days_ago = now - timedelta(days=7)
+    if type is not None:
+        if type not in PERIOD_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail="유효하지 않은 기간 타입입니다. 'week', 'month', 'year' 중 하나를 사용하세요."
+            )
+        period_data = await _get_period_preset(db, user_id, type)
+        await stats_cache.set(user_id, section, period_data)
+        return period_data
     
-    activity_result = await db.execute(
-        select(func.avg(models.Quest.progress_time)).filter(
-            models.Quest.user_id == user_id,
-            models.Quest.start_time >= seven_days_ago
+    if granularity not in engine.BUCKET_RULES:
+        raise HTTPException(
+            status_code=400,
+            detail="유효하지 않은 집계 단위입니다. 'day', 'week', 'month' 중 하나를 사용하세요."
         )
-    )
-    avg_daily_activity = activity_result.scalar_one() or 0
-    avg_daily_activity_hours = round(avg_daily_activity / 3600, 1)  # 초 단위를 시간으로 변환
-    
-    # 연속 달성 일수 계산
-    streak_days = await _calculate_streak_days(db, user_id)
-    
-    # 월간 목표 달성률 계산
-    monthly_goal_percentage = await _calculate_monthly_goal_percentage(db, user_id)
-    
-    # 레벨업 진행률 계산
-    level_progress_percentage = await _calculate_level_progress(db, user_id, hero.hero_level)
-    
-    # 캘린더 데이터 생성
-    calendar_data = await _get_calendar_data(db, user_id)
-    
-    # 태그 통계 데이터 생성
-    tags_data = await _get_tag_statistics(db, user_id)
-    
-    # 주간 활동 데이터 생성
-    weekly_data = await _get_weekly_activity(db, user_id)
     
-    # 스탯 정보 가져오기
-    stats = await _get_user_stats(db, user_id)
+    end = end or datetime.now().date() + timedelta(days=1)
+    if start is None or start >= end or (end - start).days > engine.MAX_PERIOD_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 기간입니다. start < end 이고 최대 {engine.MAX_PERIOD_DAYS}일까지 조회할 수 있습니다."
+        )
     
-    return {
-        "summary": {
-            "totalQuests": total_quests,
-            "completedQuests": completed_quests,
-            "totalXp": total_xp,
-            "avg_daily_activity": avg_daily_activity_hours,
-            "streakDays": streak_days,
-            "monthly_goal_percentage": monthly_goal_percentage,
-            "level_progress_percentage": level_progress_percentage
-        },
-        "calendar": calendar_data,
-        "tags": tags_data,
-        "weekly": weekly_data,
-        "stats": stats  # 스탯 정보 추가
-    }
+    period_data = await engine.aggregate_buckets(
+        db,
+        user_id,
+        datetime(start.year, start.month, start.day),
+        datetime(end.year, end.month, end.day),
+        granularity
+    )
+    await stats_cache.set(user_id, section, period_data)
+    return period_data
 
-@router.get("/{user_id}/period")
-async def get_period_statistics(
-    user_id: int, 
-    type: str,
-    current_user: models.User = Depends(get_current_user),
+@router.get("/{user_id}/calendar")
+async def get_calendar_statistics(
+    user_id: int,
+    month: Optional[str] = None,
+    current_user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """특정 기간(주간, 월간, 연간)의 활동 통계를 가져옵니다."""
-    if current_user.id != user_id:
+    """특정 월(YYYY-MM)의 일별 활동 캘린더를 가져옵니다. 기본값은 이번 달입니다."""
+    if current_user_id != user_id:
         raise HTTPException(
             status_code=403,
             detail="다른 사용자의 통계 정보에 접근할 권한이 없습니다."
         )
     
-    now = datetime.now()
+    section = f"calendar:{date.today()}:{month}"
+    cached = await stats_cache.get(user_id, section)
+    if cached is not MISSING:
+        return cached
     
-    if type == 'week':
-        start_date = now - timedelta(days=7)
-        period_data = await _get_weekly_activity(db, user_id, start_date, now)
-    elif type == 'month':
-        start_date = now - timedelta(days=30)
-        period_data = await _get_monthly_activity(db, user_id, start_date, now)
-    elif type == 'year':
-        start_date = now - timedelta(days=365)
-        period_data = await _get_yearly_activity(db, user_id, start_date, now)
-    else:
+    try:
+        calendar_data = await _get_calendar_data(db, user_id, month)
+    except ValueError:
         raise HTTPException(
             status_code=400,
-            detail="유효하지 않은 기간 타입입니다. 'week', 'month', 'year' 중 하나를 사용하세요."
+            detail="유효하지 않은 월 형식입니다. 'YYYY-MM' 형식을 사용하세요."
         )
-    
-    return period_data
+    await stats_cache.set(user_id, section, calendar_data)
+    return calendar_data
 
 @router.get("/{user_id}/tags")
 async def get_tag_statistics_endpoint(
     user_id: int, 
-    current_user: models.User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """사용자의 태그별 통계를 가져옵니다."""
-    if current_user.id != user_id:
+    if current_user_id != user_id:
         raise HTTPException(
             status_code=403, 
             detail="다른 사용자의 태그 통계에 접근할 권한이 없습니다."
         )
     
+    cached = await stats_cache.get(user_id, "tags")
+    if cached is not MISSING:
+        return cached
+    
     tags_data = await _get_tag_statistics(db, user_id)
+    await stats_cache.set(user_id, "tags", tags_data)
     return tags_data
 
 # 도우미 함수들
 
-async def _get_user_stats(db: AsyncSession, user_id: int):
-    """사용자의 스탯 정보를 계산합니다."""
-    try:
-        # 사용자의 완료된 퀘스트 정보 가져오기
-        quest_result = await db.execute(
-            select(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True
-            )
-        )
-        completed_quests = quest_result.scalars().all()
-        
-        # 기본 스탯 값 설정
-        stats = {
-            "strength": 10,  # 힘
-            "intelligence": 10,  # 지능
-            "vitality": 10,  # 체력
-            "dexterity": 10,  # 손재주
-            "endurance": 10,  # 인내력
-        }
-        
-        # 완료된 퀘스트의 태그에 따라 스탯 증가
-        for quest in completed_quests:
-            try:
-                if quest.tag:
-                    tags = json.loads(quest.tag) if isinstance(quest.tag, str) else quest.tag
-                    if not isinstance(tags, list):
-                        continue
-                        
-                    for tag in tags:
-                        # 태그에 따른 스탯 증가
-                        if tag == "운동 및 스포츠":
-                            stats["strength"] += 2
-                            stats["vitality"] += 2
-                        elif tag == "공부":
-                            stats["intelligence"] += 3
-                        elif tag == "자기개발":
-                            stats["intelligence"] += 2
-                            stats["dexterity"] += 1
-                        elif tag == "취미":
-                            stats["dexterity"] += 3
-                        elif tag == "명상 및 스트레칭":
-                            stats["vitality"] += 1
-                            stats["endurance"] += 2
-                        else:  # 기타
-                            # 모든 스탯에 균등하게 추가
-                            for stat in stats:
-                                stats[stat] += 0.5
-            except (json.JSONDecodeError, TypeError):
-                continue
-        
-        # 스탯이 너무 높지 않도록 최대값 설정
-        for stat in stats:
-            stats[stat] = min(round(stats[stat]), 100)
-        
-        return stats
-        
-    except Exception as e:
-        # 에러 로깅
-        print(f"Error in _get_user_stats: {e}")
-        # 기본 스탯 반환
-        return {
-            "strength": 10,
-            "intelligence": 10,
-            "vitality": 10,
-            "dexterity": 10,
-            "endurance": 10,
-        }
-    
+async def _get_hero(db: AsyncSession, user_id: int):
+    """사용자의 Hero 정보를 가져옵니다."""
+    hero_result = await db.execute(
+        select(models.Hero).filter(models.Hero.user_id == user_id)
+    )
+    return hero_result.scalar_one_or_none()
+
 async def _calculate_streak_days(db: AsyncSession, user_id: int):
-    """사용자의 연속 달성 일수를 계산합니다."""
+    """사용자의 (현재 연속 달성 일수, 최장 연속 달성 일수)를 계산합니다."""
     try:
-        now = datetime.now().date()
-        
-        # 최대 30일 전까지의 데이터 확인
-        streak = 0
-        current_date = now
-        
-        for _ in range(30):  # 최대 30일 확인
-            # 해당 날짜에 완료된 퀘스트가 있는지 확인
-            date_result = await db.execute(
-                select(models.Quest).filter(
-                    models.Quest.user_id == user_id,
-                    models.Quest.finish == True,
-                    func.date(models.Quest.finish_time) == current_date
-                )
-            )
-            completed_quests = date_result.scalars().all()
-            
-            if not completed_quests:
-                break  # 완료된 퀘스트가 없으면 스트릭 중단
-                
-            streak += 1
-            current_date -= timedelta(days=1)
-        
-        return streak
+        # 완료 날짜 목록을 한 번에 가져온 뒤 순서대로 훑어서 계산 (기간 제한 없음)
+        dates = await engine.fetch_completion_dates(db, user_id)
+        return engine.compute_streaks(dates, datetime.now().date())
         
     except Exception as e:
         print(f"Error in _calculate_streak_days: {e}")
-        return 0
+        return 0, 0
 
-async def _calculate_monthly_goal_percentage(db: AsyncSession, user_id: int):
-    """사용자의 월간 목표 달성률을 계산합니다."""
-    try:
-        # 월간 목표는 예를 들어 월 100개 퀘스트 완료라고 가정
-        monthly_target = 100
-        
-        # 이번 달 시작과 끝
+async def _get_calendar_data(db: AsyncSession, user_id: int, month: Optional[str] = None):
+    """한 달 간의 일별 활동 데이터를 생성합니다. (month: 'YYYY-MM', 기본값은 이번 달)"""
+    if month:
+        year, month_number = engine.parse_month(month)
+    else:
         now = datetime.now()
-        start_of_month = datetime(now.year, now.month, 1)
-        
-        # 이번 달 완료한 퀘스트 수 조회
-        monthly_completed_result = await db.execute(
-            select(func.count()).select_from(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True,
-                models.Quest.finish_time >= start_of_month
-            )
-        )
-        monthly_completed = monthly_completed_result.scalar_one() or 0
-        
-        # 달성률 계산 (최대 100%)
-        return min(int((monthly_completed / monthly_target) * 100), 100)
-        
-    except Exception as e:
-        print(f"Error in _calculate_monthly_goal_percentage: {e}")
-        return 0
-
-async def _calculate_level_progress(db: AsyncSession, user_id: int, current_level: int):
-    """레벨업 진행률을 계산합니다."""
-    try:
-        # 다음 레벨에 필요한 경험치 계산 (예: 레벨^2 * 100)
-        next_level_xp = (current_level + 1) ** 2 * 100
-        
-        # 현재 레벨 시작 경험치
-        current_level_xp = current_level ** 2 * 100
-        
-        # 필요한 경험치
-        xp_needed = next_level_xp - current_level_xp
-        
-        # 현재 경험치 (예: 완료된 퀘스트 수 * 10)
-        completed_result = await db.execute(
-            select(func.count()).select_from(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True
-            )
-        )
-        completed_quests = completed_result.scalar_one() or 0
-        current_xp = completed_quests * 10
-        
-        # 현재 레벨 내에서의 진행 경험치
-        current_level_progress = current_xp - current_level_xp
-        
-        # 진행률 계산
-        progress_percentage = min(int((current_level_progress / xp_needed) * 100), 99)
-        
-        return progress_percentage
-        
-    except Exception as e:
-        print(f"Error in _calculate_level_progress: {e}")
-        return 0
-
-async def _get_calendar_data(db: AsyncSession, user_id: int):
-    """한 달 간의 일별 활동 데이터를 생성합니다."""
-    now = datetime.now()
-    start_of_month = datetime(now.year, now.month, 1)
-    end_of_month = datetime(now.year, now.month + 1, 1) - timedelta(days=1)
+        year, month_number = now.year, now.month
+    start_of_month, start_of_next_month = engine.month_range(year, month_number)
     
-    # 일별 완료된 퀘스트 수 조회
-    result = await db.execute(
-        select(
-            func.date(models.Quest.finish_time).label('date'),
-            func.count().label('count')
-        ).filter(
-            models.Quest.user_id == user_id,
-            models.Quest.finish == True,
-            models.Quest.finish_time >= start_of_month,
-            models.Quest.finish_time <= end_of_month
-        ).group_by(
-            func.date(models.Quest.finish_time)
-        )
+    # 해당 월에 완료된 퀘스트를 한 번에 가져와 날짜별로 묶음
+    completed = await engine.fetch_completed_quest_times(
+        db, user_id, start_of_month, start_of_next_month
     )
-    
-    # 결과를 날짜별 맵으로 변환
-    daily_counts = {row.date.strftime('%Y-%m-%d'): row.count for row in result.all()}
-    
-    # 해당 월의 모든 날짜에 대한 데이터 생성
-    calendar_data = []
-    current_date = start_of_month
-    while current_date <= end_of_month:
-        date_str = current_date.strftime('%Y-%m-%d')
-        count = daily_counts.get(date_str, 0)
-        
-        # 활동 레벨 결정 (0-3)
-        activity_level = 0
-        if count > 0:
-            if count <= 2:
-                activity_level = 1
-            elif count <= 4:
-                activity_level = 2
-            else:
-                activity_level = 3
-        
-        # 해당 날짜에 완료된 퀘스트 ID 가져오기
-        if count > 0:
-            quests_result = await db.execute(
-                select(models.Quest.id).filter(
-                    models.Quest.user_id == user_id,
-                    models.Quest.finish == True,
-                    func.date(models.Quest.finish_time) == current_date.date()
-                )
-            )
-            quest_ids = [str(row[0]) for row in quests_result.all()]
-        else:
-            quest_ids = []
-        
-        calendar_data.append({
-            "date": date_str,
-            "activityLevel": activity_level,
-            "completedQuestIds": quest_ids
-        })
-        
-        current_date += timedelta(days=1)
-    
-    return calendar_data
+    return engine.build_calendar(completed, start_of_month, start_of_next_month)
 
 async def _get_tag_statistics(db: AsyncSession, user_id: int):
     """사용자의 태그별 통계를 생성합니다."""
-    # 현재는 샘플 데이터를 반환하고 있습니다.
-    
     try:
-        # 1. 사용자의 모든 퀘스트를 조회합니다.
-        quest_result = await db.execute(
-            select(models.Quest).filter(models.Quest.user_id == user_id)
-        )
-        quests = quest_result.scalars().all()
-        
-        # 2. 태그 정보를 집계합니다.
-        tag_counts = {}
-        for quest in quests:
-            # 태그 정보가 JSON 문자열로 저장되어 있으므로 파싱합니다.
-            try:
-                if quest.tag:
-                    tags = json.loads(quest.tag) if isinstance(quest.tag, str) else quest.tag
-                    if isinstance(tags, list):
-                        for tag in tags:
-                            if tag in tag_counts:
-                                tag_counts[tag] += 1
-                            else:
-                                tag_counts[tag] = 1
-            except (json.JSONDecodeError, TypeError):
-                continue
+        # 1~2. 태그 인덱스(quest_tags)에서 태그별 퀘스트 수를 GROUP BY 로 집계합니다.
+        tag_counts = await quest_tags.fetch_tag_counts(db, user_id)
         
         # 3. 총 태그 수를 계산합니다.
         total_count = sum(tag_counts.values()) if tag_counts else 1  # 0으로 나누기 방지
@@ -426,7 +248,7 @@ async def _get_tag_statistics(db: AsyncSession, user_id: int):
         ]
         
         # 5. 많이 사용된 순서로 정렬합니다.
-        tags_data = sorted(tags_data, key=lambda x: x["count"], reverse=True)
+        tags_data = sorted(tags_data, key=lambda x: (-x["count"], x["name"]))
         
         # 6. 데이터가 없는 경우 기본 태그 목록을 제공합니다.
         if not tags_data:
@@ -454,140 +276,36 @@ async def _get_tag_statistics(db: AsyncSession, user_id: int):
             {"name": "기타", "count": 0, "percentage": 0},
         ]
 
-async def _get_weekly_activity(
-    db: AsyncSession, 
-    user_id: int, 
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
-):
-    """주간 활동 데이터를 생성합니다."""
-    if not start_date:
-        now = datetime.now()
-        start_date = now - timedelta(days=6)  # 7일 동안의 데이터 (오늘 포함)
-    
-    if not end_date:
-        end_date = datetime.now()
-    
-    # 일별 데이터 생성
-    weekly_data = []
-    current_date = start_date
-    while current_date <= end_date:
-        date_str = current_date.strftime('%Y-%m-%d')
-        
-        # 해당 날짜에 완료된 퀘스트 수 계산
-        completed_result = await db.execute(
-            select(func.count()).select_from(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True,
-                func.date(models.Quest.finish_time) == current_date.date()
-            )
-        )
-        completed_quests = completed_result.scalar_one() or 0
-        
-        # 획득한 경험치 (예시)
-        earned_xp = completed_quests * 350
-        
-        # 목표 달성 수 (예시)
-        goal_achievement = min(completed_quests, 7)
-        
-        weekly_data.append({
-            "date": date_str,
-            "completedQuests": completed_quests,
-            "earnedXp": earned_xp,
-            "goalAchievement": goal_achievement
-        })
-        
-        current_date += timedelta(days=1)
-    
-    return weekly_data
-
-async def _get_monthly_activity(db: AsyncSession, user_id: int, start_date: datetime, end_date: datetime):
-    """월간 활동 데이터를 생성합니다. 주 단위로 데이터를 집계합니다."""
-    # 주 단위로 데이터 그룹화
-    weeks_data = []
-    
-    # 시작일을 월요일로 조정
-    days_since_monday = start_date.weekday()
-    adjusted_start = start_date - timedelta(days=days_since_monday)
-    
-    # 4주 데이터 생성
-    for week in range(4):
-        week_start = adjusted_start + timedelta(weeks=week)
-        week_end = week_start + timedelta(days=6)
-        
-        if week_end > end_date:
-            week_end = end_date
-        
-        week_label = f"Week {week+1}"
-        
-        # 해당 주에 완료된 퀘스트 수 계산
-        completed_result = await db.execute(
-            select(func.count()).select_from(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True,
-                func.date(models.Quest.finish_time) >= week_start.date(),
-                func.date(models.Quest.finish_time) <= week_end.date()
-            )
-        )
-        completed_quests = completed_result.scalar_one() or 0
-        
-        # 획득한 경험치 (예시)
-        earned_xp = completed_quests * 300
-        
-        # 목표 달성 수 (예시)
-        goal_achievement = min(completed_quests // 3, 7)
-        
-        weeks_data.append({
-            "date": week_label,
-            "completedQuests": completed_quests,
-            "earnedXp": earned_xp,
-            "goalAchievement": goal_achievement
-        })
-    
-    return weeks_data
+async def _get_weekly_activity(db: AsyncSession, user_id: int):
+    """최근 7일(오늘 포함)의 일별 활동 데이터를 생성합니다."""
+    today = engine.day_start(datetime.now())
+    return await engine.aggregate_buckets(
+        db, user_id, today - timedelta(days=6), today + timedelta(days=1), "day"
+    )
 
-async def _get_yearly_activity(db: AsyncSession, user_id: int, start_date: datetime, end_date: datetime):
-    """연간 활동 데이터를 생성합니다. 월 단위로 데이터를 집계합니다."""
-    # 월 단위로 데이터 그룹화
-    months_data = []
-    
-    # 12개월 데이터 생성
-    for month in range(12):
-        month_start = datetime(end_date.year, month + 1, 1)
-        
-        if month == 11:  # 12월일 경우
-            month_end = datetime(end_date.year, 12, 31)
-        else:
-            month_end = datetime(end_date.year, month + 2, 1) - timedelta(days=1)
-        
-        # 시간 범위가 유효한지 확인
-        if month_end < start_date or month_start > end_date:
-            continue
-        
-        month_label = month_start.strftime('%b')  # 월 이름 (Jan, Feb, ...)
-        
-        # 해당 월에 완료된 퀘스트 수 계산
-        completed_result = await db.execute(
-            select(func.count()).select_from(models.Quest).filter(
-                models.Quest.user_id == user_id,
-                models.Quest.finish == True,
-                func.date(models.Quest.finish_time) >= month_start.date(),
-                func.date(models.Quest.finish_time) <= month_end.date()
-            )
+async def _get_period_preset(db: AsyncSession, user_id: int, period_type: str):
+    """기간 타입(week, month, year)에 맞는 구간과 단위로 활동 데이터를 생성합니다."""
+    today = engine.day_start(datetime.now())
+    tomorrow = today + timedelta(days=1)
+    
+    if period_type == 'week':
+        # 최근 7일, 일 단위
+        return await _get_weekly_activity(db, user_id)
+    
+    if period_type == 'month':
+        # 이번 주를 포함한 최근 4주, 주 단위
+        this_monday = today - timedelta(days=today.weekday())
+        buckets = await engine.aggregate_buckets(
+            db, user_id, this_monday - timedelta(weeks=3), tomorrow, "week"
         )
-        completed_quests = completed_result.scalar_one() or 0
-        
-        # 획득한 경험치 (예시)
-        earned_xp = completed_quests * 250
-        
-        # 목표 달성 수 (예시)
-        goal_achievement = min(completed_quests // 10, 7)
-        
-        months_data.append({
-            "date": month_label,
-            "completedQuests": completed_quests,
-            "earnedXp": earned_xp,
-            "goalAchievement": goal_achievement
-        })
+        for index, bucket in enumerate(buckets):
+            bucket["date"] = f"Week {index + 1}"
+        return buckets
     
-    return months_data
\ No newline at end of file
+    # 올해 1월부터 이번 달까지, 월 단위
+    buckets = await engine.aggregate_buckets(
+        db, user_id, datetime(today.year, 1, 1), tomorrow, "month"
+    )
+    for bucket in buckets:
+        bucket["date"] = datetime.strptime(bucket["date"], '%Y-%m').strftime('%b')  # 월 이름 (Jan, Feb, ...)
+    return buckets
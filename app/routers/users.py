@@ -1,19 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from ..database import get_db
+from ..database import AsyncSessionLocal, get_db
 from .. import models, schemas
 from ..utils import auth
+from ..config import get_settings
+from ..core import leaderboard, user_import
 from sqlalchemy import select
-from sqlalchemy import insert  # 상단에 추가
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(
     prefix="/users",
     tags=["users"]
 )
 
+settings = get_settings()
+
 # 회원가입 요청 모델
 class UserCreate(BaseModel):
     email: EmailStr
@@ -67,20 +72,17 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
             detail="Email already registered"
         )
     
-    # 사용자 생성
-    new_user = await auth.create_user(db=db, user=user)
-
-    # ✅ Hero 자동 생성
-    await db.execute(
-        insert(models.Hero).values(
-            user_id=new_user.id,
-            hero_level=1,
-            coin=0,
-            avatar_id=0,
-            background_id=0
+    # 사용자 + Hero 생성 (한 트랜잭션)
+    try:
+        new_user = await auth.create_user(db=db, user=user)
+    except IntegrityError:
+        # 중복 체크 이후 같은 이메일로 동시에 가입한 경우
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
         )
-    )
-    await db.commit()
+    leaderboard.update_level(new_user.id, 1, name=new_user.name, profile_img=new_user.profile_img)
     
     # 응답 데이터 구성
     return UserResponse(
@@ -95,6 +97,43 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     )
 
 
+# 계정 일괄 등록 작업 응답 모델
+class UserImportJobResponse(BaseModel):
+    id: str
+    status: str  # pending / running / done / failed
+    total: int
+    created: Optional[int]
+    skipped: Optional[List[dict]]
+    error: Optional[str]
+    submitted_at: datetime
+    finished_at: Optional[datetime]
+
+# 계정 일괄 등록 (학급 단위 가입 등, 관리자 전용)
+# - 해싱에 시간이 걸리므로 백그라운드 작업으로 등록하고 202 로 바로 응답 (결과는 GET /users/import/{job_id})
+# - 이미 가입된 이메일/목록 내 중복 이메일은 건너뛰고 skipped 로 반환
+# - 사용자·영웅을 다중 행 INSERT 로 한 트랜잭션에 생성
+@router.post("/import", response_model=UserImportJobResponse, status_code=202)
+async def import_users(
+    users: List[UserCreate],
+    admin_id: int = Depends(auth.get_current_admin_id)
+):
+    if len(users) > settings.USER_IMPORT_MAX_ACCOUNTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.USER_IMPORT_MAX_ACCOUNTS} accounts per request"
+        )
+    return user_import.user_import_jobs.submit([user.dict() for user in users])
+
+# 계정 일괄 등록 작업 결과 조회 (관리자 전용)
+# - 작업 상태는 작업을 시작한 워커 프로세스의 메모리에만 있음: 여러 워커로 띄운 경우 다른 워커로 간 요청은 404
+#   (많은 계정은 python -m app.cli import-users 로 등록하는 것을 권장)
+@router.get("/import/{job_id}", response_model=UserImportJobResponse)
+async def get_import_job(job_id: str, admin_id: int = Depends(auth.get_current_admin_id)):
+    job = user_import.user_import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
 # 로그인
 @router.post("/login", response_model=LoginResponse)
 async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
@@ -142,27 +181,93 @@ async def read_users_me(current_user: models.User = Depends(auth.get_current_use
     return UserResponse.model_validate(current_user)
 
 # 모든 유저 반환
+# - 기본: id 기준 keyset 페이지네이션 (다음 페이지는 X-Next-After-Id 헤더 값을 after_id 로 전달)
+# - stream=true: 서버 사이드 커서로 읽어 NDJSON 으로 청크 단위 전송 (메모리 사용량 일정)
 @router.get("/all", response_model=list[UserResponse])
-async def get_all_users(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(models.User))
+async def get_all_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    after_id: int = Query(0, ge=0),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    if stream:
+        return StreamingResponse(
+            _stream_users(after_id),
+            media_type="application/x-ndjson"
+        )
+
+    result = await db.execute(
+        select(models.User)
+        .filter(models.User.id > after_id)
+        .order_by(models.User.id)
+        .limit(limit)
+    )
     users = result.scalars().all()
+    if len(users) == limit:
+        response.headers["X-Next-After-Id"] = str(users[-1].id)
     return [UserResponse.from_orm(user) for user in users]
 
+USER_STREAM_CHUNK_SIZE = 500
+
+async def _stream_users(after_id: int):
+    """users 를 id 순으로 서버 사이드 커서에서 읽어 NDJSON 청크로 내보냅니다."""
+    columns = [getattr(models.User, name) for name in (
+        "id", "email", "name", "phone_number", "profile_img", "join_date", "update_date"
+    )]
+    # 응답이 끝날 때까지 커서를 유지해야 하므로 요청 세션과 별도로 세션을 연다
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            select(*columns)
+            .filter(models.User.id > after_id)
+            .order_by(models.User.id)
+            .execution_options(yield_per=USER_STREAM_CHUNK_SIZE)
+        )
+        async for rows in result.partitions(USER_STREAM_CHUNK_SIZE):
+            yield "".join(UserResponse(**row._mapping).json() + "\n" for row in rows)
+
 # 전체 사용자 랭킹 조회 (hero_level 기준 내림차순, 이름 기준 오름차순)
+# 같은 레벨의 이름은 코드 포인트 순서로 비교 (대소문자·악센트 구분, 대문자가 먼저 — core/leaderboard.py 참고)
+# 다음 페이지는 마지막 항목의 (hero_level, name, id)를 after_* 로 넘겨 조회
 @router.get("/ranking")
-async def get_user_ranking(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(models.User, models.Hero)
-        .join(models.Hero, models.User.id == models.Hero.user_id)
-        .order_by(models.Hero.hero_level.desc(), models.User.name.asc())
-    )
-    rows = result.all()
-    return [
-        {
-            "id": user.id,
-            "name": user.name,
-            "profile_img": user.profile_img,
-            "hero_level": hero.hero_level
-        }
-        for user, hero in rows
-    ]
\ No newline at end of file
+async def get_user_ranking(
+    limit: int = Query(100, ge=1, le=500),
+    after_level: Optional[int] = None,
+    after_name: Optional[str] = None,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    after = None
+    if after_level is not None or after_name is not None or after_id is not None:
+        if after_level is None or after_name is None or after_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_level, after_name, after_id must be given together"
+            )
+        after = leaderboard.rank_key(after_level, after_name, after_id)
+    return await leaderboard.leaderboard.page(db, limit, after)
+
+
+# 내 순위 조회 (순위, 백분위, 바로 위/아래 사용자)
+@router.get("/ranking/me")
+async def get_my_ranking(current_user: models.User = Depends(auth.get_current_user)):
+    # 순위 구조는 시작 시 구축되고 백그라운드에서 주기적으로 다시 만들어짐 (요청 경로에서는 읽기만)
+    rank_index = leaderboard.rank_index
+    if not rank_index.ready:
+        raise HTTPException(status_code=503, detail="Ranking is being built")
+
+    entry = rank_index.get(current_user.id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Hero not found")
+
+    rank = rank_index.rank(current_user.id)
+    total = rank_index.total
+    above, below = rank_index.neighbours(current_user.id)
+    return {
+        **entry,
+        "rank": rank,
+        "total": total,
+        "percentile": round(100 * (total - rank + 1) / total, 2),
+        "above": above,
+        "below": below,
+    }
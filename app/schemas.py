@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, conint
 from typing import Optional, List  # List 추가
 from typing import Optional
 from datetime import datetime
@@ -63,4 +63,11 @@ class Hero(HeroBase):
     did_info: Optional[List[dict]] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class HeroReward(BaseModel):
+    user_id: int
+    coin: conint(gt=0)
+
+class HeroRewardBatch(BaseModel):
+    rewards: List[HeroReward]
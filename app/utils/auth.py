@@ -1,27 +1,22 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from .. import models
 from ..database import get_db
 from ..config import get_settings
+from ..core.utils import hash_password
+from ..core.cache import MISSING
+from ..core.passwords import password_hasher
+from ..core.principal_cache import principal_cache
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
-# 비밀번호 해싱
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-# 비밀번호 검증
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 # JWT 토큰 생성
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -34,48 +29,105 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[models.Use
     result = await db.execute(select(models.User).filter(models.User.email == email))
     return result.scalars().first()
 
-# 사용자 생성
+# 사용자 생성 (사용자와 영웅을 한 트랜잭션에서 생성)
 async def create_user(db: AsyncSession, user: models.User) -> models.User:
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
+    now = datetime.utcnow()
     db_user = models.User(
         email=user.email,
         password=hashed_password,  # 수정: hashed_password를 password 필드에 저장
         name=user.name,
         phone_number=user.phone_number,
-        join_date=datetime.utcnow(),
-        update_date=datetime.utcnow()
+        join_date=now,
+        update_date=now
     )
     db.add(db_user)
+    # user.id 를 얻기 위해 한 번만 flush 하고, 영웅 INSERT 는 커밋 시 함께 전송
+    await db.flush()
+    db.add(models.Hero(
+        user_id=db_user.id,
+        hero_level=1,
+        coin=0,
+        avatar_id=0,
+        background_id=0
+    ))
     await db.commit()
-    await db.refresh(db_user)
     return db_user
 
 # 사용자 인증
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[models.User]:
     user = await get_user_by_email(db, email)
-    if not user or not verify_password(password, user.password):
+    if not user:
+        return None
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+    if not valid:
         return None
+    # bcrypt 비용(BCRYPT_ROUNDS)이 바뀌었으면 로그인 시 새 비용으로 다시 저장
+    if new_hash is not None:
+        user.password = new_hash
+        await db.commit()
+        principal_cache.invalidate_user(user.id)
     return user
 
+# 캐시에 두는 사용자 컬럼 — 캐시에서 되살린 사용자에 읽지 않은 컬럼이 남으면 접근 시 지연 로딩이 일어나
+# 비동기 세션에서 MissingGreenlet 이 나므로 모든 컬럼을 보관
+PRINCIPAL_COLUMNS = tuple(models.User.__table__.columns.keys())
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+# 토큰 검증 후 클레임 반환
+def decode_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
 # 현재 사용자 가져오기
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
+    payload = decode_token(token)
+    email: str = payload["sub"]
+    expires_at = int(payload.get("exp") or 0)
+
+    # 같은 토큰(sub, exp)으로 이미 조회한 사용자면 DB 를 거치지 않고 세션에 붙여 반환
+    cached = principal_cache.get(email, expires_at)
+    if cached is not MISSING:
+        user = models.User(**cached)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
     user = await get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    principal_cache.set(
+        email, expires_at, user.id, {name: getattr(user, name) for name in PRINCIPAL_COLUMNS}
+    )
+    return user
+
+# 현재 사용자 id 만 필요할 때 (토큰 클레임만 사용, DB 조회 없음)
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    payload = decode_token(token)
+    user_id = payload.get("user_id")
+    if user_id is None:
+        raise credentials_exception
+    return int(user_id)
+
+# 관리자만 호출할 수 있는 API 용 (admins 에 등록된 사용자인지 확인하고 id 반환)
+async def get_current_admin_id(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    result = await db.execute(select(models.Admin.id).filter(models.Admin.user_id == user_id).limit(1))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return user_id
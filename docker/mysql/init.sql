@@ -23,6 +23,7 @@ CREATE TABLE IF NOT EXISTS heroes (
     intelligence INT DEFAULT 0,
     stamina INT DEFAULT 0,
     skill INT DEFAULT 0,
+    endurance INT DEFAULT 0,
     hero_level INT DEFAULT 1,
     coin INT DEFAULT 0,
     avatar_id INT DEFAULT 0,
@@ -64,7 +65,8 @@ CREATE TABLE IF NOT EXISTS receipts (
     purchase_date DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE,
-    INDEX idx_user_purchases (user_id, purchase_date)
+    INDEX idx_user_purchases (user_id, purchase_date),
+    UNIQUE INDEX uq_receipts_user_item (user_id, item_id)
 );
 
 -- ✅ Quests 테이블
@@ -84,9 +86,39 @@ CREATE TABLE IF NOT EXISTS quests (
     finish_time DATETIME,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     deadline DATETIME,
+    expired BOOLEAN NOT NULL DEFAULT FALSE,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_user_quests (user_id, quest_type, finish),
-    INDEX idx_quest_status (finish, start_time)
+    INDEX idx_quest_status (finish, start_time),
+    INDEX idx_quests_user_finish_time (user_id, finish, finish_time),
+    INDEX idx_quests_user_start_time (user_id, start_time, progress_time),
+    INDEX idx_quests_user_expired (user_id, expired, id),
+    INDEX idx_quests_user_expired_finish (user_id, expired, finish, id),
+    INDEX idx_quests_user_deadline (user_id, deadline),
+    INDEX idx_quests_expiry (finish, expired, deadline)
+);
+
+-- ✅ Quest Tags 테이블 (quests.tag 정규화 인덱스)
+CREATE TABLE IF NOT EXISTS quest_tags (
+    quest_id INT NOT NULL,
+    tag VARCHAR(50) NOT NULL,
+    user_id INT NOT NULL,
+    PRIMARY KEY (quest_id, tag),
+    FOREIGN KEY (quest_id) REFERENCES quests(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX idx_quest_tags_user_tag (user_id, tag)
+);
+
+-- ✅ User Daily Activity 테이블 (사용자/날짜별 퀘스트 완료 집계)
+CREATE TABLE IF NOT EXISTS user_daily_activity (
+    user_id INT NOT NULL,
+    activity_date DATE NOT NULL,
+    completed_count INT NOT NULL DEFAULT 0,
+    progress_seconds INT NOT NULL DEFAULT 0,
+    earned_xp INT NOT NULL DEFAULT 0,
+    tag_counts JSON,
+    PRIMARY KEY (user_id, activity_date),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
 -- ✅ Friends 테이블
@@ -188,3 +220,16 @@ CREATE TABLE IF NOT EXISTS notifications (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
+
+-- ✅ Event Outbox 테이블 (커밋 이후 처리할 이벤트, 처리되면 삭제)
+CREATE TABLE IF NOT EXISTS event_outbox (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    event_type VARCHAR(50) NOT NULL,
+    payload JSON NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    available_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    dead BOOLEAN NOT NULL DEFAULT FALSE,
+    last_error VARCHAR(255),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_event_outbox_pending (dead, available_at)
+);